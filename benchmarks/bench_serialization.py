@@ -0,0 +1,80 @@
+"""Compare size and speed of `CardData.to_bytes` against pickle and YAML.
+
+Usage:
+    python benchmarks/bench_serialization.py --num-eval-results 1000
+"""
+
+import argparse
+import pickle
+import timeit
+
+import yaml
+
+from modelcards import CardData, EvalResult
+from modelcards.card_data import model_index_to_eval_results
+
+
+def make_card_data(num_eval_results):
+    return CardData(
+        language="en",
+        license="mit",
+        library_name="timm",
+        tags=["image-classification", "resnet"],
+        datasets=["beans", "imagenet-1k"],
+        model_name="my-cool-model",
+        eval_results=[
+            EvalResult(
+                task_type="image-classification",
+                dataset_type=f"dataset-{i % 20}",
+                dataset_name=f"Dataset {i % 20}",
+                dataset_split="test",
+                metric_type=f"metric-{i % 7}",
+                metric_value=i / 3,
+            )
+            for i in range(num_eval_results)
+        ],
+    )
+
+
+def yaml_dumps(card_data):
+    return card_data.to_yaml().encode("utf-8")
+
+
+def yaml_loads(data):
+    data_dict = yaml.safe_load(data)
+    model_index = data_dict.pop("model-index", None)
+    if model_index:
+        data_dict["model_name"], data_dict["eval_results"] = (
+            model_index_to_eval_results(model_index)
+        )
+    return CardData(**data_dict)
+
+
+CODECS = {
+    "to_bytes": (lambda c: c.to_bytes(), CardData.from_bytes),
+    "pickle": (pickle.dumps, pickle.loads),
+    "yaml": (yaml_dumps, yaml_loads),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-eval-results", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    card_data = make_card_data(args.num_eval_results)
+    print(f"{'codec':<10}{'bytes':>10}{'dump (ms)':>12}{'load (ms)':>12}")
+    for name, (dump, load) in CODECS.items():
+        payload = dump(card_data)
+        dump_time = timeit.timeit(lambda: dump(card_data), number=args.number)
+        load_time = timeit.timeit(lambda: load(payload), number=args.number)
+        print(
+            f"{name:<10}{len(payload):>10}"
+            f"{dump_time / args.number * 1000:>12.3f}"
+            f"{load_time / args.number * 1000:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import pytest
+import requests
+
+from .mock_hub import MockHubServer
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    collect_ignore_glob = ["test_*.py"]
+
+
+@pytest.fixture(scope="session")
+def mock_hub_server():
+    with MockHubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def mock_hub(mock_hub_server, monkeypatch):
+    """Points modelcards' Hub requests at the local mock server."""
+
+    def upload_file(path_or_fileobj, path_in_repo, repo_id, **kwargs):
+        with open(path_or_fileobj, "rb") as f:
+            r = requests.post(f"{mock_hub_server.endpoint}/api/upload/{repo_id}", f)
+        r.raise_for_status()
+        return r.json()["commitUrl"]
+
+    monkeypatch.setattr("huggingface_hub.constants.ENDPOINT", mock_hub_server.endpoint)
+    monkeypatch.setattr("huggingface_hub.upload_file", upload_file)
+    return mock_hub_server
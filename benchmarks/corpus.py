@@ -0,0 +1,86 @@
+"""Synthetic card generators used by the benchmark suite."""
+
+import random
+from pathlib import Path
+from typing import List, Union
+
+from modelcards import CardData, EvalResult
+from modelcards.card_data import eval_results_to_model_index
+
+TASKS = ["image-classification", "text-classification", "automatic-speech-recognition"]
+DATASETS = ["beans", "imagenet-1k", "glue", "common_voice", "cifar10"]
+METRICS = ["accuracy", "f1", "precision", "recall", "wer", "bleu", "loss"]
+
+PARAGRAPH = (
+    "The model description provides basic details about the model. This includes"
+    " the architecture, version, if it was introduced in a paper, if an original"
+    " implementation is available, the author, and general information about the"
+    " model."
+)
+
+
+def make_eval_results(n: int, seed: int = 0) -> List[EvalResult]:
+    """Returns `n` eval results spread over a handful of tasks and datasets."""
+    rng = random.Random(seed)
+    return [
+        EvalResult(
+            task_type=TASKS[i % len(TASKS)],
+            dataset_type=DATASETS[i % len(DATASETS)],
+            dataset_name=DATASETS[i % len(DATASETS)].title(),
+            dataset_split="test",
+            metric_type=f"{METRICS[i % len(METRICS)]}-{i}",
+            metric_value=round(rng.random(), 4),
+        )
+        for i in range(n)
+    ]
+
+
+def make_card_data(num_eval_results: int = 0, seed: int = 0) -> CardData:
+    eval_results = make_eval_results(num_eval_results, seed) or None
+    return CardData(
+        language=["en", "fr"],
+        license="mit",
+        library_name="timm",
+        tags=["image-classification", "resnet", f"tag-{seed}"],
+        datasets=DATASETS[:2],
+        metrics=METRICS[:2],
+        eval_results=eval_results,
+        model_name=f"model-{seed}" if eval_results else None,
+    )
+
+
+def make_model_index(n: int, seed: int = 0):
+    return eval_results_to_model_index(f"model-{seed}", make_eval_results(n, seed))
+
+
+def make_body(num_sections: int = 5) -> str:
+    sections = []
+    for i in range(num_sections):
+        sections.append(f"## Section {i}\n\n{PARAGRAPH}\n\n```python\n# code\n```\n")
+    return "# my-cool-model\n\n" + "\n".join(sections)
+
+
+def make_card_content(
+    num_eval_results: int = 0,
+    num_sections: int = 5,
+    with_metadata: bool = True,
+    seed: int = 0,
+) -> str:
+    """Returns the content of a README.md with optional metadata and eval results."""
+    body = make_body(num_sections)
+    if not with_metadata:
+        return body
+    return f"---\n{make_card_data(num_eval_results, seed).to_yaml()}\n---\n{body}"
+
+
+def write_corpus(
+    directory: Union[str, Path], num_cards: int, num_eval_results: int = 10
+) -> List[Path]:
+    """Writes `num_cards` cards to `directory/<repo name>/README.md`."""
+    paths = []
+    for i in range(num_cards):
+        path = Path(directory) / f"model-{i}" / "README.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(make_card_content(num_eval_results, seed=i), encoding="utf-8")
+        paths.append(path)
+    return paths
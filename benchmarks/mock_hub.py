@@ -0,0 +1,52 @@
+"""A local stand-in for the parts of the Hugging Face Hub API used by modelcards."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.received_bytes += len(body)
+        if self.path == "/api/validate-yaml":
+            self._send(200, b"", "text/plain")
+        elif self.path.startswith("/api/upload/"):
+            repo_id = self.path[len("/api/upload/") :]
+            url = f"http://{self.headers['Host']}/{repo_id}/commit/0"
+            self._send(200, json.dumps({"commitUrl": url}).encode(), "application/json")
+        else:
+            self._send(404, b"Not found", "text/plain")
+
+    def _send(self, status, payload, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockHubServer:
+    """Serves `/api/validate-yaml` and a minimal `/api/upload/<repo_id>` endpoint on
+    localhost. Use as a context manager; `endpoint` is the server's base URL."""
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.received_bytes = 0
+        self.endpoint = "http://{}:{}".format(*self.server.server_address)
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def received_bytes(self):
+        return self.server.received_bytes
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
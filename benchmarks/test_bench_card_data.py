@@ -0,0 +1,78 @@
+import dataclasses
+
+import pytest
+
+from modelcards import CardData
+from modelcards import card_data as card_data_module
+from modelcards.card_data import eval_results_to_markdown, model_index_to_eval_results
+
+from .corpus import make_card_data, make_model_index
+
+SIZES = [10, 100, 1000]
+
+
+@pytest.mark.parametrize("num_eval_results", SIZES)
+def test_to_yaml(benchmark, num_eval_results):
+    card_data = make_card_data(num_eval_results)
+    benchmark(card_data.to_yaml)
+
+
+@pytest.mark.parametrize("num_eval_results", SIZES)
+def test_model_index_to_eval_results(benchmark, num_eval_results):
+    model_index = make_model_index(num_eval_results)
+    _, eval_results = benchmark(model_index_to_eval_results, model_index)
+    assert len(eval_results) == num_eval_results
+
+
+@pytest.mark.parametrize("num_eval_results", SIZES)
+def test_to_bytes(benchmark, num_eval_results):
+    card_data = make_card_data(num_eval_results)
+    benchmark(card_data.to_bytes)
+
+
+@pytest.mark.parametrize("num_eval_results", SIZES)
+def test_from_bytes(benchmark, num_eval_results):
+    payload = make_card_data(num_eval_results).to_bytes()
+    card_data = benchmark(CardData.from_bytes, payload)
+    assert len(card_data.eval_results) == num_eval_results
+
+
+@pytest.mark.parametrize("num_eval_results", SIZES)
+def test_eval_results_to_markdown(benchmark, num_eval_results):
+    eval_results = make_card_data(num_eval_results).eval_results
+    benchmark.pedantic(
+        eval_results_to_markdown,
+        args=(eval_results,),
+        setup=card_data_module._EVAL_RESULTS_TABLE_CACHE.clear,
+        rounds=20,
+    )
+
+
+@pytest.mark.parametrize("num_eval_results", SIZES)
+def test_eval_results_to_markdown_cached(benchmark, num_eval_results):
+    eval_results = make_card_data(num_eval_results).eval_results
+    eval_results_to_markdown(eval_results)
+    benchmark(eval_results_to_markdown, eval_results)
+
+
+@pytest.mark.parametrize("num_eval_results", SIZES)
+def test_merge_eval_results(benchmark, num_eval_results):
+    # Half of the new results replace existing ones, half are added.
+    new_eval_results = make_card_data(num_eval_results, seed=1).eval_results
+    new_eval_results = new_eval_results[num_eval_results // 2 :] + [
+        dataclasses.replace(r, metric_type=f"new-{r.metric_type}")
+        for r in new_eval_results[: num_eval_results // 2]
+    ]
+
+    def merge():
+        card_data = make_card_data(num_eval_results)
+        card_data.merge_eval_results(new_eval_results)
+
+    benchmark(merge)
+
+
+@pytest.mark.parametrize("num_eval_results", SIZES)
+def test_fingerprint(benchmark, num_eval_results):
+    card_data = make_card_data(num_eval_results)
+    card_data.fingerprint()
+    benchmark(card_data.fingerprint)
@@ -0,0 +1,44 @@
+import pytest
+
+from modelcards import ModelCard, RepoCard
+
+from .corpus import make_card_content, make_card_data
+
+CARDS = {
+    "small": dict(num_eval_results=1, num_sections=5),
+    "large": dict(num_eval_results=1000, num_sections=200),
+    "no-metadata": dict(num_sections=5, with_metadata=False),
+}
+
+
+@pytest.mark.parametrize("kind", list(CARDS))
+def test_repocard_init(benchmark, kind):
+    content = make_card_content(**CARDS[kind])
+    benchmark(RepoCard, content)
+
+
+@pytest.mark.parametrize("num_eval_results", [0, 100])
+def test_from_template(benchmark, num_eval_results):
+    card_data = make_card_data(num_eval_results)
+    benchmark(
+        ModelCard.from_template,
+        card_data,
+        model_id="my-cool-model",
+        model_description="Some really helpful description...",
+    )
+
+
+def test_str(benchmark):
+    card = RepoCard(make_card_content(**CARDS["large"]))
+    benchmark(str, card)
+
+
+def test_validate(benchmark, mock_hub):
+    card = RepoCard(make_card_content(**CARDS["small"]))
+    benchmark(card.validate)
+
+
+def test_push_to_hub(benchmark, mock_hub):
+    card = RepoCard(make_card_content(**CARDS["small"]))
+    url = benchmark(card.push_to_hub, "user/model-0")
+    assert url.startswith(mock_hub.endpoint)
@@ -0,0 +1,39 @@
+import pytest
+
+from modelcards import RepoCard
+from modelcards.corpus import CorpusReader, CorpusWriter
+
+from .corpus import write_corpus
+
+NUM_CARDS = 200
+
+
+@pytest.fixture(scope="module")
+def card_paths(tmp_path_factory):
+    return write_corpus(tmp_path_factory.mktemp("cards"), NUM_CARDS)
+
+
+@pytest.fixture(scope="module")
+def packed_path(card_paths, tmp_path_factory):
+    path = tmp_path_factory.mktemp("packed") / "cards.mcpk"
+    with CorpusWriter(path) as writer:
+        for card_path in card_paths:
+            writer.add(card_path.parent.name, card_path.read_text(encoding="utf-8"))
+    return path
+
+
+def test_metadata_scan_files(benchmark, card_paths):
+    benchmark(lambda: [RepoCard.load(path).data for path in card_paths])
+
+
+def test_metadata_scan_packed(benchmark, packed_path):
+    def scan():
+        with CorpusReader(packed_path) as reader:
+            return [data for _, data in reader.iter_metadata()]
+
+    benchmark(scan)
+
+
+def test_random_access_packed(benchmark, packed_path):
+    with CorpusReader(packed_path) as reader:
+        benchmark(lambda: reader[f"model-{NUM_CARDS // 2}"].data)
@@ -0,0 +1,53 @@
+"""Multi-threaded stress benchmarks of the parse and render paths.
+
+Each benchmark runs the same fixed amount of work on a thread pool of increasing size.
+On a free-threaded build of Python (3.13t and later), the time should go down as
+threads are added, up to the number of cores. With the GIL, it stays roughly flat, and
+the benchmarks only check that contention doesn't make it worse.
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modelcards import ModelCard, RepoCard
+from modelcards.interning import InternPool
+
+from .corpus import make_card_content, make_card_data
+
+NUM_TASKS = 32
+THREADS = [1, 2, 4, 8]
+
+
+def _run(benchmark, num_threads, task):
+    benchmark.extra_info["gil_enabled"] = getattr(
+        sys, "_is_gil_enabled", lambda: True
+    )()
+    with ThreadPoolExecutor(num_threads) as executor:
+        benchmark.pedantic(
+            lambda: list(executor.map(task, range(NUM_TASKS))),
+            rounds=5,
+            warmup_rounds=1,
+        )
+
+
+@pytest.mark.parametrize("num_threads", THREADS)
+def test_parse_threads(benchmark, num_threads):
+    contents = [make_card_content(num_eval_results=10, seed=i) for i in range(8)]
+    pool = InternPool()
+    _run(benchmark, num_threads, lambda i: RepoCard(contents[i % 8], intern_pool=pool))
+
+
+@pytest.mark.parametrize("num_threads", THREADS)
+def test_render_threads(benchmark, num_threads):
+    card_data = make_card_data(num_eval_results=10).freeze()
+
+    def render(i):
+        return str(
+            ModelCard.from_template(
+                card_data.replace(license=f"license-{i % 4}"), model_id=f"model-{i}"
+            )
+        )
+
+    _run(benchmark, num_threads, render)
@@ -2,7 +2,7 @@
 # There's no way to ignore "F401 '...' imported but unused" warnings in this
 # module, but to preserve other warnings. So, don't check this module at all.
 
-from .card_data import CardData, EvalResult
+from .card_data import CardData, EvalResult, FrozenCardData
 from .cards import ModelCard, RepoCard
 
 __version__ = "0.1.6"
@@ -0,0 +1,343 @@
+"""Incremental generation of cards from templates and metadata files.
+
+A build file lists the cards to generate. Each target renders a template (the default
+model card template if not given) with the metadata found in a data file, and saves
+the result to its output path:
+
+    targets:
+      - output: models/my-cool-model/README.md
+        data: configs/my-cool-model.yaml
+        template: templates/modelcard.md
+
+Paths are relative to the build file. A data file holds the card's metadata, in the
+same format as the YAML block of a card (including `model-index`), plus an optional
+`template_kwargs` mapping passed to the template.
+
+Each build records the digests of the inputs and output of every target in a manifest,
+so later builds (including after a restart) only re-render the targets whose template
+or data changed, or whose output was modified or deleted. In watch mode, the inputs
+are polled and only the targets depending on a changed file are rebuilt.
+
+Example:
+    Build the cards listed in `cards.yaml`, then rebuild them as their inputs change:
+
+        modelcards-build cards.yaml --watch
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import yaml
+
+from .cards import TEMPLATE_MODELCARD_PATH, ModelCard, _card_data_from_dict
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Target:
+    """A card generated from a template and a data file.
+
+    Args:
+        output (`Path`):
+            Where the rendered card is saved.
+        data (`Path`):
+            A YAML file with the card's metadata, and optionally a `template_kwargs`
+            mapping.
+        template (`Path`, *optional*):
+            The template to render. Defaults to the default model card template.
+    """
+
+    output: Path
+    data: Path
+    template: Path = TEMPLATE_MODELCARD_PATH
+
+    @property
+    def inputs(self) -> Tuple[Path, Path]:
+        return (self.template, self.data)
+
+
+def load_targets(build_file: Union[str, Path]) -> List[Target]:
+    """Reads the targets listed in a build file. Relative paths are resolved against
+    the build file's directory.
+
+    Raises:
+        ValueError: When the build file is not a mapping with a list of `targets`, or
+            when a target is missing its `output` or `data`.
+    """
+    build_file = Path(build_file)
+    spec = yaml.safe_load(build_file.read_text(encoding="utf-8"))
+    if not isinstance(spec, dict) or not isinstance(spec.get("targets"), list):
+        raise ValueError(f"Build file '{build_file}' should have a list of `targets`.")
+    root = build_file.parent
+    targets = []
+    for entry in spec["targets"]:
+        if not isinstance(entry, dict) or "output" not in entry or "data" not in entry:
+            raise ValueError(
+                f"Targets of build file '{build_file}' should have an `output` and a"
+                f" `data` path, got {entry!r}."
+            )
+        kwargs = {"output": root / entry["output"], "data": root / entry["data"]}
+        if entry.get("template"):
+            kwargs["template"] = root / entry["template"]
+        targets.append(Target(**kwargs))
+    return targets
+
+
+def default_manifest_path(build_file: Union[str, Path]) -> Path:
+    """The manifest used for `build_file` by default: `.modelcards-manifest.json`
+    in the same directory."""
+    return Path(build_file).parent / ".modelcards-manifest.json"
+
+
+def render_target(target: Target) -> ModelCard:
+    """Renders the card of `target` with `ModelCard.from_template`."""
+    data_dict = yaml.safe_load(target.data.read_text(encoding="utf-8")) or {}
+    if not isinstance(data_dict, dict):
+        raise ValueError(f"Data file '{target.data}' should be a dict")
+    template_kwargs = data_dict.pop("template_kwargs", None) or {}
+    card_data = _card_data_from_dict(data_dict)
+    return ModelCard.from_template(
+        card_data, template_path=target.template, **template_kwargs
+    )
+
+
+class _Digests:
+    """Content digests of files, reusing the manifest's digest when a file's size and
+    modification time did not change, and computing each digest at most once per
+    build."""
+
+    def __init__(self, previous: Dict[str, list]):
+        self._previous = previous
+        self.current: Dict[str, list] = {}
+
+    def __call__(self, path: Path) -> Optional[str]:
+        key = str(path)
+        entry = self.current.get(key)
+        if entry is not None:
+            return entry[2]
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        entry = self._previous.get(key)
+        if entry is None or entry[:2] != [stat.st_mtime_ns, stat.st_size]:
+            digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+            entry = [stat.st_mtime_ns, stat.st_size, digest]
+        self.current[key] = entry
+        return entry[2]
+
+
+def _read_manifest(path: Path) -> Dict:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {"files": {}, "targets": {}}
+    except ValueError:
+        logger.warning(f"Build manifest '{path}' is corrupted. Rebuilding all cards.")
+        return {"files": {}, "targets": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"files": {}, "targets": {}}
+    return manifest
+
+
+def _write_manifest(path: Path, manifest: Dict):
+    # Written to a temporary file first, so an interrupted write can't corrupt it.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, path)
+
+
+def build(
+    targets: Iterable[Target],
+    manifest_path: Union[str, Path],
+    force: bool = False,
+) -> Dict[str, list]:
+    """Renders and saves the cards of the `targets` that are out of date.
+
+    A target is out of date when its template or data file changed since it was last
+    built, when its output is missing or was modified, or when it is not in the
+    manifest yet. Unchanged files are recognized by their size and modification time,
+    so an up to date build reads none of its inputs.
+
+    Args:
+        targets (`Iterable[Target]`):
+            The targets to build, such as the ones returned by `load_targets`.
+        manifest_path (`Union[str, Path]`):
+            The build manifest, which is created if it doesn't exist.
+        force (`bool`, *optional*):
+            Whether to rebuild all the targets, even if they are up to date. Defaults
+            to False.
+
+    Returns:
+        `Dict[str, list]`: The outputs that were `built`, the ones `skipped` because
+        they were up to date, and the ones that `failed` to render (which are retried
+        by the next build).
+    """
+    manifest_path = Path(manifest_path)
+    manifest = _read_manifest(manifest_path)
+    digests = _Digests(manifest["files"])
+    report = {"built": [], "skipped": [], "failed": []}
+
+    for target in targets:
+        key = str(target.output)
+        inputs = {str(p): digests(p) for p in target.inputs}
+        previous = manifest["targets"].get(key)
+        if (
+            not force
+            and previous is not None
+            and previous["inputs"] == inputs
+            and previous["output"] == digests(target.output)
+        ):
+            report["skipped"].append(key)
+            continue
+
+        try:
+            card = render_target(target)
+            content = str(card)
+            # Don't touch outputs whose content would not change.
+            if (
+                digests(target.output)
+                != hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+            ):
+                card.save(target.output)
+                digests.current.pop(key, None)
+        except Exception as exc:
+            logger.error(f"Failed to build '{key}': {type(exc).__name__}: {exc}")
+            manifest["targets"].pop(key, None)
+            report["failed"].append(key)
+            continue
+        manifest["targets"][key] = {"inputs": inputs, "output": digests(target.output)}
+        report["built"].append(key)
+
+    # Files of targets that were not part of this build are kept, so building a subset
+    # of the targets doesn't invalidate the others.
+    manifest["files"].update(digests.current)
+    manifest["version"] = MANIFEST_VERSION
+    _write_manifest(manifest_path, manifest)
+    return report
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watch(
+    build_file: Union[str, Path],
+    manifest_path: Optional[Union[str, Path]] = None,
+    interval: float = 1.0,
+    on_build: Optional[Callable[[Dict[str, list]], None]] = None,
+    stop: Optional[threading.Event] = None,
+):
+    """Builds the targets of `build_file`, then polls their inputs and rebuilds the
+    targets depending on each file that changes. Changes to the build file itself
+    reload the list of targets.
+
+    Args:
+        build_file (`Union[str, Path]`):
+            The build file listing the targets.
+        manifest_path (`Union[str, Path]`, *optional*):
+            The build manifest. Defaults to `.modelcards-manifest.json` next to the
+            build file.
+        interval (`float`, *optional*):
+            Seconds between two polls of the inputs. Defaults to 1.
+        on_build (`Callable`, *optional*):
+            Called with the report of every build (see `build`).
+        stop (`threading.Event`, *optional*):
+            Stops watching when set. Defaults to watching until interrupted.
+    """
+    build_file = Path(build_file)
+    if manifest_path is None:
+        manifest_path = default_manifest_path(build_file)
+    stop = stop or threading.Event()
+
+    def run(targets):
+        report = build(targets, manifest_path)
+        if report["built"] or report["failed"]:
+            logger.info(
+                f"Built {len(report['built'])} cards, {len(report['failed'])} failed."
+            )
+        if on_build is not None:
+            on_build(report)
+
+    build_file_stat = None
+    targets: List[Target] = []
+    stats: Dict[Path, Optional[Tuple[int, int]]] = {}
+    while True:
+        stat = _stat(build_file)
+        if stat != build_file_stat:
+            build_file_stat = stat
+            try:
+                targets = load_targets(build_file)
+            except (OSError, ValueError, yaml.YAMLError) as exc:
+                # Keep watching the previous targets until the build file is fixed.
+                logger.error(f"Failed to load build file '{build_file}': {exc}")
+            else:
+                # Which targets to rebuild when a file changes.
+                dependents: Dict[Path, List[Target]] = {}
+                for target in targets:
+                    for path in (*target.inputs, target.output):
+                        dependents.setdefault(path, []).append(target)
+                stats = {path: _stat(path) for path in dependents}
+                run(targets)
+                # Saved outputs changed since they were stat'ed.
+                stats.update((t.output, _stat(t.output)) for t in targets)
+        else:
+            affected = []
+            for path, previous in stats.items():
+                current = _stat(path)
+                if current != previous:
+                    stats[path] = current
+                    affected += dependents[path]
+            if affected:
+                affected = list(dict.fromkeys(affected))
+                run(affected)
+                stats.update((t.output, _stat(t.output)) for t in affected)
+        if stop.wait(interval):
+            return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate cards from templates and metadata files, incrementally."
+    )
+    parser.add_argument("build_file", help="YAML file listing the cards to build.")
+    parser.add_argument(
+        "--manifest", help="Defaults to .modelcards-manifest.json next to build_file."
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild all cards.")
+    parser.add_argument(
+        "--watch", action="store_true", help="Rebuild cards as their inputs change."
+    )
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    manifest = args.manifest or default_manifest_path(args.build_file)
+    if args.watch:
+        if args.force:
+            build(load_targets(args.build_file), manifest, force=True)
+        try:
+            watch(args.build_file, manifest, interval=args.interval)
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(json.dumps(build(load_targets(args.build_file), manifest, args.force)))
+
+
+if __name__ == "__main__":
+    main()
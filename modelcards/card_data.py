@@ -1,16 +1,27 @@
 import copy
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+import hashlib
+import operator
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import FrozenInstanceError, dataclass, fields
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import yaml
 
+from .instrumentation import span
 
-@dataclass
+
+@dataclass(eq=False)
 class EvalResult:
     """
     Flattened representation of individual evaluation results found in model-index.
     """
 
+    # The memoized digest is kept in a slot, out of the fields found in `vars()`.
+    __slots__ = ("__dict__", "__weakref__", "_digest")
+
     # Required
 
     # The task identifier
@@ -73,6 +84,39 @@ class EvalResult:
     # If true, indicates that evaluation was generated by Hugging Face (vs. self-reported).
     verified: Optional[bool] = None
 
+    def fingerprint(self) -> str:
+        """Returns a stable hex digest of the EvalResult's fields. Unless the
+        EvalResult holds dicts or lists, which can be modified in place, it is memoized
+        until one of the fields is reassigned."""
+        return _eval_result_digest(self).hex()
+
+    def __eq__(self, other):
+        # Equal when their fields produce the same metadata, consistently with the
+        # hash and with `CardData.__eq__`.
+        if not isinstance(other, EvalResult):
+            return NotImplemented
+        return _eval_result_digest(self) == _eval_result_digest(other)
+
+    def __hash__(self):
+        return hash(_eval_result_digest(self))
+
+    def to_bytes(self) -> bytes:
+        """Encodes the EvalResult with the compact binary format found in
+        `modelcards.serialization`."""
+        from .serialization import dumps
+
+        return dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EvalResult":
+        """Decodes an EvalResult previously encoded with `EvalResult.to_bytes`."""
+        from .serialization import loads
+
+        eval_result = loads(data)
+        if not isinstance(eval_result, EvalResult):
+            raise ValueError("Payload does not contain an EvalResult.")
+        return eval_result
+
 
 @dataclass
 class CardData:
@@ -148,6 +192,132 @@ class CardData:
             if self.model_name is None:
                 raise ValueError("`eval_results` requires `model_name` to be set.")
 
+    def merge_eval_results(
+        self,
+        eval_results: Union[EvalResult, Iterable[EvalResult]],
+        policy: str = "replace",
+    ) -> Dict[str, int]:
+        """Merges new eval results into the existing ones.
+
+        Eval results are identified by their task type, dataset type, dataset config,
+        dataset split and metric type. Eval results with a new identity are appended.
+        Existing ones are looked up in a hash index, so merging `m` results into `n`
+        costs O(n + m).
+
+        Args:
+            eval_results (`Union[EvalResult, Iterable[EvalResult]]`):
+                The eval results to merge. Can be any iterable, such as a generator.
+            policy (`str`, *optional*):
+                What to do when an eval result with the same identity already exists:
+                "replace" it with the new one, "keep" the existing one, or raise an
+                "error". Later entries of `eval_results` also override earlier ones
+                with the same identity under "replace". Defaults to "replace".
+
+        Returns:
+            `Dict[str, int]`: The number of eval results that were `added`,
+            `replaced` and `kept`.
+
+        Raises:
+            ValueError: When `policy` is "error" and an eval result already exists, in
+                which case nothing is merged.
+            ValueError: When eval results are added but `model_name` is not set.
+
+        Example:
+            >>> from modelcards.card_data import CardData, EvalResult
+            >>> card_data = CardData(
+            ...     model_name="my-cool-model",
+            ...     eval_results=[EvalResult("image-classification", "beans", "Beans", "acc", 0.9)],
+            ... )
+            >>> card_data.merge_eval_results([
+            ...     EvalResult("image-classification", "beans", "Beans", "acc", 0.95),
+            ...     EvalResult("image-classification", "beans", "Beans", "f1", 0.8),
+            ... ])
+            {'added': 1, 'replaced': 1, 'kept': 0}
+            >>> [r.metric_value for r in card_data.eval_results]
+            [0.95, 0.8]
+        """
+        if policy not in ("replace", "keep", "error"):
+            raise ValueError(
+                f"Provided policy '{policy}' should be one of ['replace', 'keep',"
+                " 'error']."
+            )
+        if isinstance(eval_results, EvalResult):
+            eval_results = [eval_results]
+
+        existing = self.eval_results or []
+        index = {_eval_result_identity(r): i for i, r in enumerate(existing)}
+        added: Dict[Tuple, EvalResult] = {}
+        replaced: Dict[int, EvalResult] = {}
+        kept = 0
+        for eval_result in eval_results:
+            key = _eval_result_identity(eval_result)
+            i = index.get(key)
+            if i is None and (key not in added or policy == "replace"):
+                added[key] = eval_result
+            elif policy == "error":
+                raise ValueError(f"Eval result {key} already exists.")
+            elif policy == "replace":
+                replaced[i] = eval_result
+            else:
+                kept += 1
+
+        if added and self.model_name is None:
+            raise ValueError("`eval_results` requires `model_name` to be set.")
+        if added or replaced:
+            merged = list(existing)
+            for i, eval_result in replaced.items():
+                merged[i] = eval_result
+            merged.extend(added.values())
+            self.eval_results = merged
+        return {"added": len(added), "replaced": len(replaced), "kept": kept}
+
+    def fingerprint(self) -> str:
+        """Returns a canonical digest of the card data, computed directly from its
+        values rather than from its YAML. Two CardData with the same fingerprint
+        produce the same metadata.
+
+        The fingerprint does not depend on the order of the keys, nor on the order of
+        the eval results, and ignores keys set to `None`. The digest of each eval
+        result without dict or list values is memoized until one of its fields is
+        reassigned, so fingerprinting a card with many eval results again is cheap.
+
+        Returns:
+            `str`: A 32 character hex digest.
+
+        Example:
+            >>> from modelcards.card_data import CardData
+            >>> a = CardData(language="en", license="mit")
+            >>> b = CardData(license="mit", language="en", tags=None)
+            >>> a.fingerprint() == b.fingerprint()
+            True
+            >>> a == b
+            True
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for key in sorted(self.__dict__):
+            value = self.__dict__[key]
+            if value is None or key == "eval_results" or key.startswith("_"):
+                continue
+            _update_digest(h, key)
+            _update_digest(h, value)
+        if self.eval_results is not None:
+            # Summing the digests makes the result independent of the order.
+            total = sum(
+                int.from_bytes(_eval_result_digest(r), "little")
+                for r in self.eval_results
+            )
+            h.update(b"E%d:" % len(self.eval_results))
+            h.update((total % (1 << 128)).to_bytes(16, "little"))
+        return h.hexdigest()
+
+    def __eq__(self, other):
+        if not isinstance(other, CardData):
+            return NotImplemented
+        return self.fingerprint() == other.fingerprint()
+
+    def __hash__(self):
+        return hash(self.fingerprint())
+
     def to_dict(self):
         """Converts CardData to a dict. It also formats the internal eval_results to
         be compatible with the model-index format.
@@ -168,13 +338,210 @@ class CardData:
 
     def to_yaml(self):
         """Dumps CardData to a YAML block for inclusion in a README.md file."""
-        return yaml.dump(self.to_dict(), sort_keys=False).strip()
+        with span("to_yaml") as s:
+            yaml_block = yaml.dump(self.to_dict(), sort_keys=False).strip()
+            s.record_bytes(yaml_block)
+        return yaml_block
+
+    def to_bytes(self) -> bytes:
+        """Encodes CardData with the compact binary format found in
+        `modelcards.serialization`. This is much cheaper than dumping to YAML and
+        parsing it again when moving card data between processes or caching it.
+
+        Example:
+            >>> from modelcards.card_data import CardData
+            >>> card_data = CardData(language="en", tags=["resnet"])
+            >>> CardData.from_bytes(card_data.to_bytes()).to_dict()
+            {'language': 'en', 'tags': ['resnet']}
+        """
+        from .serialization import dumps
+
+        return dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, intern_pool: Optional[Any] = None) -> "CardData":
+        """Decodes CardData previously encoded with `CardData.to_bytes`. Strings are
+        shared through `intern_pool` (a `modelcards.interning.InternPool`) if given.
+        """
+        from .serialization import loads
+
+        card_data = loads(data, intern_pool=intern_pool)
+        if not isinstance(card_data, CardData):
+            raise ValueError("Payload does not contain CardData.")
+        return card_data
+
+    def replace(self, **changes) -> "CardData":
+        """Returns a new CardData with the values of `changes`, leaving this one
+        untouched. Values that are not changed are shared with this CardData, not
+        copied.
+
+        Example:
+            >>> from modelcards.card_data import CardData
+            >>> card_data = CardData(language="en", license="mit")
+            >>> card_data.replace(license="apache-2.0").to_dict()
+            {'language': 'en', 'license': 'apache-2.0'}
+            >>> card_data.license
+            'mit'
+        """
+        values = {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+        values.update(changes)
+        return type(self)(**values)
+
+    def freeze(self) -> "FrozenCardData":
+        """Returns an immutable copy of this CardData. See
+        `modelcards.FrozenCardData`."""
+        return FrozenCardData(**self.__dict__)
 
     def __repr__(self):
         return self.to_yaml()
 
 
-def model_index_to_eval_results(model_index: List[Dict[str, Any]]):
+class FrozenCardData(CardData):
+    def __init__(self, **kwargs):
+        """An immutable `CardData`, which can be shared between threads without
+        locking.
+
+        It takes the same arguments as `CardData`. The values are deep copied when the
+        FrozenCardData is created: lists become tuples, dicts become read-only
+        mappings and eval results become read-only too. Assigning an attribute raises
+        `dataclasses.FrozenInstanceError`. Use `replace` to derive a modified copy and
+        `thaw` to get a mutable `CardData` back. As it can't change, its fingerprint
+        (and hash) is only computed once.
+
+        Example:
+            >>> from modelcards import CardData
+            >>> frozen = CardData(language="en", tags=["vision"]).freeze()
+            >>> frozen.tags
+            ('vision',)
+            >>> frozen.license = "mit"
+            Traceback (most recent call last):
+            ...
+            dataclasses.FrozenInstanceError: cannot assign to field 'license'
+            >>> frozen.replace(license="mit").to_dict()
+            {'language': 'en', 'license': 'mit', 'tags': ['vision']}
+        """
+        card_data = CardData(**kwargs)
+        values = {
+            k: _freeze(v)
+            for k, v in card_data.__dict__.items()
+            if not k.startswith("_")
+        }
+        object.__setattr__(self, "__dict__", values)
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def replace(self, **changes) -> "FrozenCardData":
+        """Returns a new FrozenCardData with the values of `changes`. Only the changed
+        values are copied, the others are shared with this FrozenCardData."""
+        values = {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+        values.update((k, _freeze(v)) for k, v in changes.items())
+        if values.get("eval_results") and values.get("model_name") is None:
+            raise ValueError("`eval_results` requires `model_name` to be set.")
+        if isinstance(values.get("eval_results"), EvalResult):
+            values["eval_results"] = (values["eval_results"],)
+        replaced = object.__new__(FrozenCardData)
+        object.__setattr__(replaced, "__dict__", values)
+        return replaced
+
+    def freeze(self) -> "FrozenCardData":
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (CardData.freeze, (self.thaw(),))
+
+    def thaw(self) -> CardData:
+        """Returns a mutable `CardData` deep copy of this FrozenCardData."""
+        return CardData(
+            **{k: _thaw(v) for k, v in self.__dict__.items() if not k.startswith("_")}
+        )
+
+    def merge_eval_results(self, eval_results, policy="replace"):
+        raise FrozenInstanceError(
+            "cannot merge eval results into a FrozenCardData, use `thaw` first"
+        )
+
+    def fingerprint(self) -> str:
+        fingerprint = self.__dict__.get("_fingerprint")
+        if fingerprint is None:
+            fingerprint = self.__dict__["_fingerprint"] = super().fingerprint()
+        return fingerprint
+
+    def to_dict(self):
+        return self.thaw().to_dict()
+
+    def to_bytes(self) -> bytes:
+        return self.thaw().to_bytes()
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, intern_pool: Optional[Any] = None
+    ) -> "FrozenCardData":
+        return CardData.from_bytes(data, intern_pool=intern_pool).freeze()
+
+
+class _FrozenEvalResult(EvalResult):
+    """A read-only `EvalResult`, as found in `FrozenCardData.eval_results`."""
+
+    def __init__(self, *args, **kwargs):
+        eval_result = EvalResult(*args, **kwargs)
+        for name, value in eval_result.__dict__.items():
+            object.__setattr__(self, name, _freeze(value))
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (_FrozenEvalResult, tuple(_thaw(v) for v in _EVAL_RESULT_VALUES(self)))
+
+
+def _freeze(value: Any) -> Any:
+    """Returns a deep, immutable copy of `value`."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    elif isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    elif isinstance(value, set):
+        return frozenset(value)
+    elif isinstance(value, EvalResult) and not isinstance(value, _FrozenEvalResult):
+        return _FrozenEvalResult(*_EVAL_RESULT_VALUES(value))
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Returns a deep, mutable copy of a value frozen with `_freeze`."""
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    elif isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    elif isinstance(value, frozenset):
+        return set(value)
+    elif isinstance(value, EvalResult):
+        return EvalResult(*(_thaw(v) for v in _EVAL_RESULT_VALUES(value)))
+    return value
+
+
+def model_index_to_eval_results(
+    model_index: List[Dict[str, Any]], intern_pool: Optional[Any] = None
+):
     """Takes in a model index and returns a list of `modelcards.EvalResult` objects.
 
     A detailed spec of the model index can be found here:
@@ -184,6 +551,10 @@ def model_index_to_eval_results(model_index: List[Dict[str, Any]]):
         model_index (`List[Dict[str, Any]]`):
         A model index data structure, likely coming from a README.md file on the
         Hugging Face Hub.
+        intern_pool (`modelcards.interning.InternPool`, *optional*):
+        If provided, the strings of the model index are interned in the pool, so
+        eval results loaded from many cards share their task, dataset and metric
+        identifiers instead of each holding their own copies.
 
     Returns:
         - model_name (`str`):
@@ -227,6 +598,9 @@ def model_index_to_eval_results(model_index: List[Dict[str, Any]]):
         'accuracy'
     """
 
+    if intern_pool is not None:
+        intern_pool.intern_value(model_index)
+
     eval_results = []
     for elem in model_index:
         name = elem["name"]
@@ -283,6 +657,98 @@ def _remove_none(obj):
         return obj
 
 
+_EVAL_RESULT_VALUES = operator.attrgetter(*(f.name for f in fields(EvalResult)))
+
+
+_SCALAR_TYPES = (str, int, float, type(None))
+
+
+def _eval_result_digest(eval_result: EvalResult) -> bytes:
+    """Returns the digest of an eval result's fields. The digest is stored on the eval
+    result along with the values it was computed from, and reused while the fields
+    still hold these very objects. It is only stored when none of the values can be
+    modified in place, that is when they are all scalars or the eval result is
+    frozen."""
+    values = _EVAL_RESULT_VALUES(eval_result)
+    cached = getattr(eval_result, "_digest", None)
+    if cached is not None and all(map(operator.is_, cached[0], values)):
+        return cached[1]
+    h = hashlib.blake2b(digest_size=16)
+    _update_digest(h, values)
+    digest = h.digest()
+    if isinstance(eval_result, _FrozenEvalResult) or all(
+        isinstance(v, _SCALAR_TYPES) for v in values
+    ):
+        object.__setattr__(eval_result, "_digest", (values, digest))
+    return digest
+
+
+def _update_digest(h, value: Any):
+    """Feeds a canonical encoding of `value` to the hash `h`. Dicts are encoded
+    independently of their key order, and `None` values inside dicts are skipped as
+    they are when dumping to YAML."""
+    if value is None:
+        h.update(b"N")
+    elif value is True or value is False:
+        h.update(b"T" if value else b"F")
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        h.update(b"S%d:" % len(encoded))
+        h.update(encoded)
+    elif isinstance(value, int):
+        h.update(b"I%d:" % value)
+    elif isinstance(value, float):
+        h.update(b"D" + repr(value).encode() + b":")
+    elif isinstance(value, (list, tuple)):
+        h.update(b"L%d:" % len(value))
+        for item in value:
+            _update_digest(h, item)
+    elif isinstance(value, Mapping):
+        items = []
+        for key, item in value.items():
+            if item is not None:
+                item_hash = hashlib.blake2b(digest_size=16)
+                _update_digest(item_hash, key)
+                _update_digest(item_hash, item)
+                items.append(item_hash.digest())
+        h.update(b"M%d:" % len(items))
+        for item_digest in sorted(items):
+            h.update(item_digest)
+    elif isinstance(value, EvalResult):
+        h.update(b"R")
+        h.update(_eval_result_digest(value))
+    else:
+        h.update(f"O{type(value).__name__}:{value!r}:".encode("utf-8"))
+
+
+def _eval_result_identity(eval_result: EvalResult) -> Tuple:
+    """The key identifying an eval result within a card: the same metric on the same
+    task, dataset, config and split."""
+    return (
+        eval_result.task_type,
+        eval_result.dataset_type,
+        eval_result.dataset_config,
+        eval_result.dataset_split,
+        eval_result.metric_type,
+    )
+
+
+def _group_eval_results(
+    eval_results: List[EvalResult],
+) -> Dict[Tuple[str, str], List[EvalResult]]:
+    """Groups eval results by (task_type, dataset_type), in order of first appearance."""
+    # Metrics are reported on a unique task-and-dataset basis.
+    # Here, we make a map of those pairs and the associated EvalResults.
+    task_and_ds_types_map = dict()
+    for eval_result in eval_results:
+        task_and_ds_pair = (eval_result.task_type, eval_result.dataset_type)
+        if task_and_ds_pair in task_and_ds_types_map:
+            task_and_ds_types_map[task_and_ds_pair].append(eval_result)
+        else:
+            task_and_ds_types_map[task_and_ds_pair] = [eval_result]
+    return task_and_ds_types_map
+
+
 def eval_results_to_model_index(model_name: str, eval_results: List[EvalResult]):
     """Takes in given model name and list of `modelcards.EvalResult` and returns a
     valid model-index that will be compatible with the format expected by the
@@ -316,19 +782,9 @@ def eval_results_to_model_index(model_name: str, eval_results: List[EvalResult])
 
     """
 
-    # Metrics are reported on a unique task-and-dataset basis.
-    # Here, we make a map of those pairs and the associated EvalResults.
-    task_and_ds_types_map = dict()
-    for eval_result in eval_results:
-        task_and_ds_pair = (eval_result.task_type, eval_result.dataset_type)
-        if task_and_ds_pair in task_and_ds_types_map:
-            task_and_ds_types_map[task_and_ds_pair].append(eval_result)
-        else:
-            task_and_ds_types_map[task_and_ds_pair] = [eval_result]
-
-    # Use the map from above to generate the model index data.
+    # Use the map of task-and-dataset pairs to generate the model index data.
     model_index_data = []
-    for (task_type, dataset_type), results in task_and_ds_types_map.items():
+    for (task_type, dataset_type), results in _group_eval_results(eval_results).items():
         data = {
             "task": {
                 "type": task_type,
@@ -364,3 +820,86 @@ def eval_results_to_model_index(model_name: str, eval_results: List[EvalResult])
         }
     ]
     return _remove_none(model_index)
+
+
+# Rendered eval results tables, keyed by the digests of the eval results they show.
+_EVAL_RESULTS_TABLE_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_EVAL_RESULTS_TABLE_CACHE_SIZE = 128
+_EVAL_RESULTS_TABLE_CACHE_LOCK = threading.Lock()
+
+
+def _escape_cell(value: Any) -> str:
+    return "" if value is None else str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def eval_results_to_markdown(eval_results: List[EvalResult]) -> str:
+    """Renders a list of `modelcards.EvalResult` as a Markdown table. Rows are grouped
+    by task and dataset, the same way `eval_results_to_model_index` groups them.
+
+    Tables are cached by the fingerprints of the eval results they show, so rendering
+    eval results that did not change reuses the previously rendered table.
+
+    Args:
+        eval_results (`List[EvalResult]`):
+            List of `modelcards.EvalResult` objects containing the metrics to render.
+
+    Returns:
+        `str`: The Markdown table.
+
+    Example:
+        >>> from modelcards.card_data import eval_results_to_markdown, EvalResult
+        >>> print(eval_results_to_markdown([
+        ...     EvalResult(
+        ...         task_type="image-classification",
+        ...         dataset_type="beans",
+        ...         dataset_name="Beans",
+        ...         metric_type="accuracy",
+        ...         metric_value=0.9,
+        ...     ),
+        ...     EvalResult(
+        ...         task_type="image-classification",
+        ...         dataset_type="beans",
+        ...         dataset_name="Beans",
+        ...         metric_type="f1",
+        ...         metric_value=0.8,
+        ...     ),
+        ... ]))
+        | Task | Dataset | Split | Metric | Value |
+        |:-----|:--------|:------|:-------|------:|
+        | image-classification | Beans | | accuracy | 0.9 |
+        | | | | f1 | 0.8 |
+    """
+    # The table depends on the order of the eval results, so the key does too.
+    key = b"".join(_eval_result_digest(r) for r in eval_results)
+    with _EVAL_RESULTS_TABLE_CACHE_LOCK:
+        table = _EVAL_RESULTS_TABLE_CACHE.get(key)
+        if table is not None:
+            _EVAL_RESULTS_TABLE_CACHE.move_to_end(key)
+            return table
+
+    lines = [
+        "| Task | Dataset | Split | Metric | Value |",
+        "|:-----|:--------|:------|:-------|------:|",
+    ]
+    for results in _group_eval_results(eval_results).values():
+        for i, result in enumerate(results):
+            task = dataset = ""
+            if i == 0:
+                task = _escape_cell(result.task_name or result.task_type)
+                dataset = _escape_cell(result.dataset_name)
+            split = _escape_cell(result.dataset_split)
+            if result.dataset_config:
+                split = f"{_escape_cell(result.dataset_config)} {split}".strip()
+            metric = _escape_cell(result.metric_name or result.metric_type)
+            value = _escape_cell(result.metric_value)
+            if result.verified:
+                value += " (verified)"
+            cells = (task, dataset, split, metric, value)
+            lines.append("|" + "|".join(f" {c} " if c else " " for c in cells) + "|")
+    table = "\n".join(lines)
+
+    with _EVAL_RESULTS_TABLE_CACHE_LOCK:
+        _EVAL_RESULTS_TABLE_CACHE[key] = table
+        if len(_EVAL_RESULTS_TABLE_CACHE) > _EVAL_RESULTS_TABLE_CACHE_SIZE:
+            _EVAL_RESULTS_TABLE_CACHE.popitem(last=False)
+    return table
@@ -1,71 +1,177 @@
+import copy
+import hashlib
+import logging
 import re
-import tempfile
 from pathlib import Path
 from typing import Optional, Union
 
-import jinja2
-import requests
 import yaml
-from huggingface_hub import hf_hub_download, upload_file
-from huggingface_hub.utils.logging import get_logger
 
-from .card_data import CardData, model_index_to_eval_results
+from .card_data import CardData, eval_results_to_markdown, model_index_to_eval_results
+from .instrumentation import span
+from .interning import InternPool
+from .sections import SectionIndex
+
+# jinja2, requests and huggingface_hub are imported inside the methods using them, so
+# `import modelcards` stays cheap for code that only builds or parses card metadata.
 
 TEMPLATE_MODELCARD_PATH = Path(__file__).parent / "modelcard_template.md"
 REGEX_YAML_BLOCK = re.compile(
     r"---[\n\r]+([\S\s]*?)[\n\r]+---[\n\r]([\S\s].*)", re.DOTALL
 )
 
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
+
+
+def _load_card_data(
+    yaml_block: str, intern_pool: Optional[InternPool] = None
+) -> CardData:
+    """Parses the YAML metadata block of a card into `CardData`, converting its
+    `model-index` to eval results."""
+    data_dict = yaml.safe_load(yaml_block)
+
+    # The YAML block's data should be a dictionary
+    if not isinstance(data_dict, dict):
+        raise ValueError("repo card metadata block should be a dict")
+
+    return _card_data_from_dict(data_dict, intern_pool)
+
+
+def _card_data_from_dict(
+    data_dict: dict, intern_pool: Optional[InternPool] = None
+) -> CardData:
+    """Builds `CardData` from card metadata, converting its `model-index` to eval
+    results. `data_dict` is modified in place."""
+    if intern_pool is not None:
+        intern_pool.intern_value(data_dict)
+
+    model_index = data_dict.pop("model-index", None)
+    if model_index:
+        try:
+            model_name, eval_results = model_index_to_eval_results(model_index)
+            data_dict["model_name"] = model_name
+            data_dict["eval_results"] = eval_results
+        except KeyError:
+            logger.warning(
+                "Invalid model-index. Not loading eval results into CardData."
+            )
+
+    return CardData(**data_dict)
 
 
 class RepoCard:
-    def __init__(self, content: str):
+    def __init__(self, content: str, intern_pool: Optional[InternPool] = None):
         """Initialize a RepoCard from string content. The content should be a
         Markdown file with a YAML block at the beginning and a Markdown body.
 
         Args:
             content (`str`): The content of the Markdown file.
+            intern_pool (`modelcards.interning.InternPool`, *optional*):
+                A pool used to share the strings of the parsed metadata with other
+                cards loaded through the same pool. Useful to reduce memory when
+                loading many cards. Defaults to None.
 
         Raises:
             ValueError: When the content of the repo card metadata is not found.
             ValueError: When the content of the repo card metadata is not a dictionary.
         """
-        self.content = content
-        match = REGEX_YAML_BLOCK.search(content)
-        if match:
-            # Metadata found in the YAML block
-            yaml_block = match.group(1)
-            self.text = match.group(2)
-            data_dict = yaml.safe_load(yaml_block)
-
-            # The YAML block's data should be a dictionary
-            if not isinstance(data_dict, dict):
-                raise ValueError("repo card metadata block should be a dict")
-        else:
-            # Model card without metadata... create empty metadata
-            logger.warning(
-                "Repo card metadata block was not found. Setting CardData to empty."
-            )
-            data_dict = {}
-            self.text = content
-
-        model_index = data_dict.pop("model-index", None)
-        if model_index:
-            try:
-                model_name, eval_results = model_index_to_eval_results(model_index)
-                data_dict["model_name"] = model_name
-                data_dict["eval_results"] = eval_results
-            except KeyError:
+        with span("parse") as s:
+            s.record_bytes(content)
+            self.content = content
+            match = REGEX_YAML_BLOCK.search(content)
+            if match:
+                # Metadata found in the YAML block
+                self.text = match.group(2)
+                self.data = _load_card_data(match.group(1), intern_pool)
+            else:
+                # Model card without metadata... create empty metadata
                 logger.warning(
-                    "Invalid model-index. Not loading eval results into CardData."
+                    "Repo card metadata block was not found. Setting CardData to empty."
                 )
+                self.text = content
+                self.data = CardData()
+
+    @property
+    def text(self) -> str:
+        """The Markdown body of the card. If it was edited through
+        `RepoCard.sections`, the edits are joined into a single string here."""
+        if self._sections is not None and self._sections.modified:
+            return self._sections.text
+        return self._text
+
+    @text.setter
+    def text(self, text: str):
+        self._text = text
+        self._sections = None
+        self._text_digest = None
+
+    @property
+    def sections(self) -> SectionIndex:
+        r"""A `modelcards.sections.SectionIndex` over the card's text, built on first
+        access. Editing sections through it defers rebuilding `text` until it's read.
 
-        self.data = CardData(**data_dict)
+        Example:
+            >>> from modelcards import RepoCard
+            >>> card = RepoCard("---\nlicense: mit\n---\n# My model\n\n## Eval results\n\nTODO\n")
+            >>> card.sections.replace_body("Eval results", "\n| acc | 0.9 |\n")
+            >>> card.text
+            '# My model\n\n## Eval results\n\n| acc | 0.9 |\n'
+        """
+        if self._sections is None:
+            self._sections = SectionIndex(self._text)
+        return self._sections
 
     def __str__(self):
         return f"---\n{self.data.to_yaml()}\n---\n{self.text}"
 
+    def fingerprint(self) -> str:
+        """Returns a canonical digest of the card, combining `CardData.fingerprint` with
+        a digest of its text. It changes whenever `str(card)` would change, other than
+        for the order of metadata keys and eval results, without dumping the metadata
+        to YAML.
+
+        Returns:
+            `str`: A 32 character hex digest.
+        """
+        text = self.text
+        if self._text_digest is None or self._text_digest[0] is not text:
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            self._text_digest = (text, digest)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(bytes.fromhex(self.data.fingerprint()))
+        h.update(self._text_digest[1])
+        return h.hexdigest()
+
+    def __eq__(self, other):
+        if not isinstance(other, RepoCard):
+            return NotImplemented
+        return self.fingerprint() == other.fingerprint()
+
+    def __hash__(self):
+        return hash(self.fingerprint())
+
+    def update_eval_results_table(self, title: str = "Eval results"):
+        """Renders the card's `data.eval_results` as a Markdown table in the body of
+        the section titled `title`, replacing its current body. The section is appended
+        to the card if it doesn't exist. Does nothing if the card has no eval results.
+
+        Tables are cached by content (see `modelcards.card_data.eval_results_to_markdown`),
+        so calling this again when the metrics did not change is cheap.
+
+        Args:
+            title (`str`, *optional*):
+                The title of the section to render the table in. Defaults to
+                "Eval results", the section used by the default template.
+        """
+        if not self.data.eval_results:
+            return
+        body = f"\n{eval_results_to_markdown(self.data.eval_results)}\n\n"
+        section = self.sections.get(title)
+        if section is None:
+            self.sections.append(f"\n## {title}\n{body}")
+        elif section.body != body:
+            self.sections.replace_body(title, body)
+
     def save(self, filepath: Union[Path, str]):
         r"""Save a RepoCard to a file.
 
@@ -82,7 +188,13 @@ class RepoCard:
         filepath.write_text(str(self), encoding="utf-8")
 
     @classmethod
-    def load(cls, repo_id_or_path: Union[str, Path], repo_type=None, token=None):
+    def load(
+        cls,
+        repo_id_or_path: Union[str, Path],
+        repo_type=None,
+        token=None,
+        intern_pool: Optional[InternPool] = None,
+    ):
         """Initialize a RepoCard from a Hugging Face Hub repo's README.md or a local filepath.
 
         Args:
@@ -94,6 +206,9 @@ class RepoCard:
             token (`str`, *optional*):
                 Authentication token, obtained with `huggingface_hub.HfApi.login` method. Will default to
                 the stored token.
+            intern_pool (`modelcards.interning.InternPool`, *optional*):
+                A pool used to share the strings of the parsed metadata across loaded
+                cards. Defaults to None.
 
         Returns:
             `modelcards.RepoCard`: The RepoCard (or subclass) initialized from the repo's
@@ -108,11 +223,13 @@ class RepoCard:
         if Path(repo_id_or_path).exists():
             card_path = Path(repo_id_or_path)
         else:
+            from huggingface_hub import hf_hub_download
+
             card_path = hf_hub_download(
                 repo_id_or_path, "README.md", repo_type=repo_type, use_auth_token=token
             )
 
-        return cls(Path(card_path).read_text(encoding="utf-8"))
+        return cls(Path(card_path).read_text(encoding="utf-8"), intern_pool=intern_pool)
 
     def validate(self, repo_type="model"):
         """Validates card against Hugging Face Hub's model card validation logic.
@@ -140,16 +257,21 @@ class RepoCard:
         }
         headers = {"Accept": "text/plain"}
 
-        try:
-            r = requests.post(
-                "https://huggingface.co/api/validate-yaml", body, headers=headers
-            )
-            r.raise_for_status()
-        except requests.exceptions.HTTPError as exc:
-            if r.status_code == 400:
-                raise RuntimeError(r.text)
-            else:
-                raise exc
+        import requests
+        from huggingface_hub import constants
+
+        with span("validate") as s:
+            s.record_bytes(body["content"])
+            try:
+                r = requests.post(
+                    f"{constants.ENDPOINT}/api/validate-yaml", body, headers=headers
+                )
+                r.raise_for_status()
+            except requests.exceptions.HTTPError as exc:
+                if r.status_code == 400:
+                    raise RuntimeError(r.text)
+                else:
+                    raise exc
 
     def push_to_hub(
         self,
@@ -186,31 +308,42 @@ class RepoCard:
         """
         repo_name = repo_id.split("/")[-1]
 
+        # The card itself is never modified, so it can be pushed from several threads.
+        card = self
         if self.data.model_name and self.data.model_name != repo_name:
             logger.warning(
                 f"Set model name {self.data.model_name} in CardData does not match "
-                f"repo name {repo_name}. Updating model name to match repo name."
+                f"repo name {repo_name}. Pushing the card with the repo name as model "
+                "name."
             )
-            self.data.model_name = repo_name
+            card = copy.copy(self)
+            card.data = self.data.replace(model_name=repo_name)
 
         # Validate card before pushing to hub
-        self.validate(repo_type=repo_type)
+        card.validate(repo_type=repo_type)
+
+        import tempfile
+
+        from huggingface_hub import upload_file
 
         with tempfile.TemporaryDirectory() as tmpdir:
             tmp_path = Path(tmpdir) / "README.md"
-            tmp_path.write_text(str(self))
-            url = upload_file(
-                path_or_fileobj=str(tmp_path),
-                path_in_repo="README.md",
-                repo_id=repo_id,
-                token=token,
-                repo_type=repo_type,
-                identical_ok=True,
-                commit_message=commit_message,
-                commit_description=commit_description,
-                create_pr=create_pr,
-                revision=revision,
-            )
+            content = str(card)
+            tmp_path.write_text(content)
+            with span("upload") as s:
+                s.record_bytes(content)
+                url = upload_file(
+                    path_or_fileobj=str(tmp_path),
+                    path_in_repo="README.md",
+                    repo_id=repo_id,
+                    token=token,
+                    repo_type=repo_type,
+                    identical_ok=True,
+                    commit_message=commit_message,
+                    commit_description=commit_description,
+                    create_pr=create_pr,
+                    revision=revision,
+                )
         return url
 
 
@@ -225,6 +358,8 @@ class ModelCard(RepoCard):
         """Initialize a ModelCard from a template. By default, it uses the default template.
 
         Templates are Jinja2 templates that can be customized by passing keyword arguments.
+        If `card_data` has eval results, they are rendered as a Markdown table and passed
+        to the template as `eval_results_table`, unless that keyword argument is given.
 
         Args:
             card_data (`modelcards.CardData`):
@@ -285,7 +420,16 @@ class ModelCard(RepoCard):
             ... )
 
         """
-        content = jinja2.Template(Path(template_path).read_text()).render(
-            card_data=card_data.to_yaml(), **template_kwargs
-        )
+        import jinja2
+
+        if card_data.eval_results and "eval_results_table" not in template_kwargs:
+            template_kwargs["eval_results_table"] = eval_results_to_markdown(
+                card_data.eval_results
+            )
+        card_data_yaml = card_data.to_yaml()
+        with span("render") as s:
+            content = jinja2.Template(Path(template_path).read_text()).render(
+                card_data=card_data_yaml, **template_kwargs
+            )
+            s.record_bytes(content)
         return cls(content)
@@ -0,0 +1,323 @@
+"""Packed corpus files holding many cards, with memory-mapped random access.
+
+Storing many cards as individual README.md files makes scans pay for a file open (and
+an inode lookup) per card. A packed corpus stores them all in a single file instead,
+with the YAML metadata blocks and the Markdown bodies in separate regions, so scanning
+the metadata of every card only touches the (small) metadata region.
+
+Layout:
+    MAGIC (4 bytes) | VERSION (1 byte) | bodies | headers | repo ids | index | trailer
+
+The index has one fixed size entry per card, holding the offset and length of its
+repo id, metadata block and body within their regions. The trailer stores the start of
+each region and the number of cards, followed by MAGIC again.
+
+Example:
+    >>> from modelcards import RepoCard
+    >>> from modelcards.corpus import CorpusReader, CorpusWriter
+    >>> with CorpusWriter("/tmp/cards.mcpk") as writer:
+    ...     writer.add("user/my-model", RepoCard("---\\nlicense: mit\\n---\\n# My model\\n"))
+    >>> with CorpusReader("/tmp/cards.mcpk") as reader:
+    ...     card = reader["user/my-model"]
+    ...     card.data.license
+    'mit'
+"""
+
+import mmap
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
+
+from .card_data import CardData
+from .cards import REGEX_YAML_BLOCK, RepoCard, _load_card_data
+from .instrumentation import span
+from .interning import InternPool
+
+MAGIC = b"MCPK"
+VERSION = 1
+
+_PREAMBLE = struct.Struct("<4sB")
+# Repo id, metadata block and body of a card, as (offset, length) within each region.
+_ENTRY = struct.Struct("<QIQIQI")
+# Start of the bodies, headers, repo ids and index regions, then the number of cards.
+_TRAILER = struct.Struct("<QQQQQ4s")
+
+
+class CorpusWriter:
+    def __init__(self, path: Union[str, Path]):
+        """Writes cards to a packed corpus file, which can be read with `CorpusReader`.
+
+        Bodies are written to `path` as cards are added. Metadata blocks and repo ids
+        are spooled to temporary files and appended when the writer is closed, so
+        memory use does not grow with the size of the corpus beyond a few bytes of
+        index per card.
+
+        Args:
+            path (`Union[str, Path]`):
+                Path to the corpus file. It is overwritten if it exists.
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "wb")
+        self._file.write(_PREAMBLE.pack(MAGIC, VERSION))
+        self._headers = tempfile.TemporaryFile()
+        self._ids = tempfile.TemporaryFile()
+        self._bodies_size = self._headers_size = self._ids_size = 0
+        self._index = bytearray()
+        self._repo_ids: Set[str] = set()
+
+    def __len__(self):
+        return len(self._repo_ids)
+
+    def add(self, repo_id: str, card: Union[RepoCard, str]):
+        """Adds a card to the corpus.
+
+        Args:
+            repo_id (`str`):
+                The id the card can be looked up by. Must be unique within the corpus.
+            card (`Union[modelcards.RepoCard, str]`):
+                The card, or the content of its README.md file. Content is stored as is,
+                without being parsed.
+
+        Raises:
+            ValueError: When a card was already added for `repo_id`.
+        """
+        if repo_id in self._repo_ids:
+            raise ValueError(f"A card was already added for repo id '{repo_id}'.")
+        if isinstance(card, RepoCard):
+            # `to_yaml` returns "{}" for empty metadata, which is stored as no header.
+            header = card.data.to_yaml() if card.data.to_dict() else ""
+            body = card.text
+        else:
+            match = REGEX_YAML_BLOCK.search(card)
+            header, body = (match.group(1), match.group(2)) if match else ("", card)
+
+        repo_id_bytes = repo_id.encode("utf-8")
+        header_bytes = header.encode("utf-8")
+        body_bytes = body.encode("utf-8")
+        self._index += _ENTRY.pack(
+            self._ids_size,
+            len(repo_id_bytes),
+            self._headers_size,
+            len(header_bytes),
+            self._bodies_size,
+            len(body_bytes),
+        )
+        self._ids.write(repo_id_bytes)
+        self._headers.write(header_bytes)
+        self._file.write(body_bytes)
+        self._ids_size += len(repo_id_bytes)
+        self._headers_size += len(header_bytes)
+        self._bodies_size += len(body_bytes)
+        self._repo_ids.add(repo_id)
+
+    def close(self):
+        """Appends the metadata, repo ids, index and trailer, then closes the file."""
+        if self._file.closed:
+            return
+        try:
+            bodies_start = _PREAMBLE.size
+            starts = []
+            for f in (self._headers, self._ids):
+                starts.append(self._file.tell())
+                f.seek(0)
+                shutil.copyfileobj(f, self._file)
+            index_start = self._file.tell()
+            self._file.write(self._index)
+            self._file.write(
+                _TRAILER.pack(
+                    bodies_start, *starts, index_start, len(self._repo_ids), MAGIC
+                )
+            )
+        finally:
+            self._file.close()
+            self._headers.close()
+            self._ids.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class CorpusReader:
+    def __init__(
+        self, path: Union[str, Path], intern_pool: Optional[InternPool] = None
+    ):
+        """Reads a packed corpus file written by `CorpusWriter`.
+
+        The file is memory-mapped, and cards can be looked up by position or repo id.
+        Returned cards are parsed lazily: their metadata is only parsed when `data` is
+        first accessed, and their body only decoded when `text` is first accessed.
+        Until then, they hold a zero-copy view of the mapped file.
+
+        Args:
+            path (`Union[str, Path]`):
+                Path to the corpus file.
+            intern_pool (`modelcards.interning.InternPool`, *optional*):
+                A pool used to share the strings of the parsed metadata across cards.
+                Defaults to None.
+
+        Raises:
+            ValueError: When the file is not a packed corpus, or was written with a
+                newer version of the format.
+        """
+        self.path = Path(path)
+        self.intern_pool = intern_pool
+        with open(self.path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"'{self.path}' is not a packed card corpus.")
+        self._buffer = memoryview(self._mmap)
+
+        if len(self._buffer) < _PREAMBLE.size + _TRAILER.size:
+            self.close()
+            raise ValueError(f"'{self.path}' is not a packed card corpus.")
+        magic, version = _PREAMBLE.unpack_from(self._buffer, 0)
+        *starts, count, trailer_magic = _TRAILER.unpack_from(
+            self._buffer, len(self._buffer) - _TRAILER.size
+        )
+        if magic != MAGIC or trailer_magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{self.path}' is not a packed card corpus.")
+        if version > VERSION:
+            self.close()
+            raise ValueError(
+                f"'{self.path}' has version {version}, only versions up to {VERSION}"
+                " are supported."
+            )
+        self._bodies_start, self._headers_start, self._ids_start, self._index_start = (
+            starts
+        )
+        self._count = count
+        self._positions: Optional[Dict[str, int]] = None
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, i: int) -> Tuple[int, int, int, int, int, int]:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("corpus index out of range")
+        return _ENTRY.unpack_from(self._buffer, self._index_start + i * _ENTRY.size)
+
+    def _position(self, key: Union[int, str]) -> int:
+        if isinstance(key, str):
+            if self._positions is None:
+                # Built on the first lookup by repo id, then O(1).
+                self._positions = {self.repo_id(i): i for i in range(self._count)}
+            return self._positions[key]
+        return key
+
+    def repo_id(self, i: int) -> str:
+        """Returns the repo id of the card at position `i`."""
+        offset, length = self._entry(i)[:2]
+        start = self._ids_start + offset
+        return str(self._buffer[start : start + length], "utf-8")
+
+    def repo_ids(self) -> Iterator[str]:
+        """Iterates over the repo ids of the cards, in the order they were added."""
+        for i in range(self._count):
+            yield self.repo_id(i)
+
+    def __contains__(self, repo_id: str):
+        try:
+            self._position(repo_id)
+        except KeyError:
+            return False
+        return True
+
+    def header(self, key: Union[int, str]) -> memoryview:
+        """Returns a zero-copy view of the UTF-8 encoded metadata block of a card, by
+        position or repo id. It is empty if the card has no metadata."""
+        offset, length = self._entry(self._position(key))[2:4]
+        start = self._headers_start + offset
+        return self._buffer[start : start + length]
+
+    def body(self, key: Union[int, str]) -> memoryview:
+        """Returns a zero-copy view of the UTF-8 encoded Markdown body of a card, by
+        position or repo id."""
+        offset, length = self._entry(self._position(key))[4:6]
+        start = self._bodies_start + offset
+        return self._buffer[start : start + length]
+
+    def metadata(self, key: Union[int, str]) -> CardData:
+        """Parses the metadata of a card, by position or repo id, without reading its
+        body."""
+        return _parse_header(self.header(key), self.intern_pool)
+
+    def iter_metadata(self) -> Iterator[Tuple[str, CardData]]:
+        """Iterates over the repo id and metadata of every card, only reading the
+        metadata region of the file."""
+        for i in range(self._count):
+            yield self.repo_id(i), self.metadata(i)
+
+    def __getitem__(self, key: Union[int, str]) -> RepoCard:
+        """Returns a lazily parsed card, by position or repo id."""
+        i = self._position(key)
+        return _PackedCard(self.header(i), self.body(i), self.intern_pool)
+
+    def __iter__(self) -> Iterator[RepoCard]:
+        for i in range(self._count):
+            yield self[i]
+
+    def close(self):
+        """Releases the mapping. If cards returned by the reader still hold views of
+        the file, it is unmapped once they are garbage collected instead."""
+        self._buffer.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _parse_header(header: memoryview, intern_pool: Optional[InternPool]) -> CardData:
+    if not header:
+        return CardData()
+    with span("parse") as s:
+        s.record_bytes(header)
+        return _load_card_data(str(header, "utf-8"), intern_pool)
+
+
+class _PackedCard(RepoCard):
+    """A `RepoCard` read from a packed corpus, whose `data` and `text` are only parsed
+    when first accessed."""
+
+    def __init__(
+        self,
+        header: memoryview,
+        body: memoryview,
+        intern_pool: Optional[InternPool] = None,
+    ):
+        self._header = header
+        self._body = body
+        self._intern_pool = intern_pool
+        self._sections = None
+        self._text_digest = None
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set yet.
+        d = self.__dict__
+        if name == "data" and "_header" in d:
+            self.data = _parse_header(d["_header"], d["_intern_pool"])
+            return self.data
+        if name == "_text" and "_body" in d:
+            self._text = str(d["_body"], "utf-8")
+            return self._text
+        if name == "content" and "_header" in d:
+            header, body = str(d["_header"], "utf-8"), str(d["_body"], "utf-8")
+            self.content = f"---\n{header}\n---\n{body}" if header else body
+            return self.content
+        raise AttributeError(name)
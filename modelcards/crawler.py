@@ -0,0 +1,231 @@
+"""Concurrent loading of many repo cards, streaming their metadata to a JSONL file.
+
+Example:
+    Crawl every repo listed in `repos.txt` (one repo id per line) with 16 workers and
+    at most 10 requests per second to the Hub:
+
+        modelcards-crawl repos.txt --output cards.jsonl --workers 16 --rate 10
+
+    If interrupted, running the same command again resumes where it stopped.
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, Union
+from urllib.parse import urlparse
+
+from .cards import RepoCard
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    def __init__(self, rate: Optional[float]):
+        """Spaces out calls made to the same host, across threads.
+
+        Args:
+            rate (`float`, *optional*):
+                Maximum number of calls per second to each host. `None` disables rate
+                limiting.
+        """
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        """Blocks until a call to `host` is allowed."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_repo_ids(path: Union[str, Path]) -> Iterator[str]:
+    """Reads repo ids from a listing file, such as a local stand-in for an org listing.
+
+    The file either has one repo id per line (blank lines and lines starting with `#`
+    are ignored) or is a JSON Lines file whose records have an `id` or `modelId` key,
+    such as the output of `huggingface_hub.HfApi.list_models`.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                yield record.get("id") or record["modelId"]
+            else:
+                yield line
+
+
+def list_org_repo_ids(org: str, token: Optional[str] = None) -> Iterator[str]:
+    """Lists the ids of the model repos owned by `org` on the Hugging Face Hub."""
+    from huggingface_hub import HfApi
+
+    for model in HfApi().list_models(author=org, token=token):
+        yield model.id
+
+
+def _read_checkpoint(path: Path) -> Set[str]:
+    if not path.exists():
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def _host(repo_id_or_path: str) -> Optional[str]:
+    if Path(repo_id_or_path).exists():
+        return None
+    from huggingface_hub import constants
+
+    return urlparse(constants.ENDPOINT).netloc
+
+
+def _crawl_one(repo_id, rate_limiter, repo_type, token):
+    try:
+        host = _host(repo_id)
+        if host is not None:
+            rate_limiter.wait(host)
+        card = RepoCard.load(repo_id, repo_type=repo_type, token=token)
+        return {"repo_id": repo_id, "data": card.data.to_dict()}
+    except Exception as exc:
+        return {"repo_id": repo_id, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def crawl(
+    repo_ids: Iterable[str],
+    output_path: Union[str, Path],
+    checkpoint_path: Optional[Union[str, Path]] = None,
+    max_workers: int = 8,
+    rate: Optional[float] = None,
+    repo_type: Optional[str] = None,
+    token: Optional[str] = None,
+) -> Dict[str, int]:
+    """Loads the cards of many repos concurrently with `RepoCard.load` and appends their
+    metadata to a JSON Lines file as they are parsed.
+
+    Each output line is `{"repo_id": ..., "data": card.data.to_dict()}`, or
+    `{"repo_id": ..., "error": ...}` if the card could not be loaded. The repo id of
+    every loaded card is also appended to a checkpoint file, and repo ids found in the
+    checkpoint are skipped, so an interrupted crawl can be resumed by running it again
+    with the same arguments. Failures (mostly transient, such as rate limits and
+    timeouts) are not checkpointed, so they are retried by the next run, and the output
+    may hold error records followed by the record of a later successful load.
+
+    Args:
+        repo_ids (`Iterable[str]`):
+            Repo ids (or local card paths) to load. It is consumed lazily, so it can be
+            a generator such as `read_repo_ids(...)` or `list_org_repo_ids(...)`.
+        output_path (`Union[str, Path]`):
+            The JSON Lines file to append the results to.
+        checkpoint_path (`Union[str, Path]`, *optional*):
+            The checkpoint file. Defaults to `output_path` with a `.checkpoint` suffix.
+        max_workers (`int`, *optional*):
+            Number of cards loaded concurrently. Defaults to 8.
+        rate (`float`, *optional*):
+            Maximum number of requests per second to each host. Defaults to None,
+            which disables rate limiting. Local paths are never rate limited.
+        repo_type (`str`, *optional*):
+            The type of the repos. Defaults to None, which will use "model".
+        token (`str`, *optional*):
+            Authentication token. Will default to the stored token.
+
+    Returns:
+        `Dict[str, int]`: The number of cards `loaded`, `failed` and `skipped` because
+        they were already loaded according to the checkpoint.
+    """
+    output_path = Path(output_path)
+    if checkpoint_path is None:
+        checkpoint_path = output_path.with_name(output_path.name + ".checkpoint")
+    checkpoint_path = Path(checkpoint_path)
+    done = _read_checkpoint(checkpoint_path)
+    rate_limiter = RateLimiter(rate)
+    counts = {"loaded": 0, "failed": 0, "skipped": 0}
+
+    with open(output_path, "a", encoding="utf-8") as output, open(
+        checkpoint_path, "a", encoding="utf-8"
+    ) as checkpoint, ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def write(futures):
+            # Only this thread writes, so the files need no locking.
+            for future in futures:
+                record = future.result()
+                output.write(json.dumps(record, default=str) + "\n")
+                output.flush()
+                if "error" in record:
+                    counts["failed"] += 1
+                    logger.warning(
+                        f"Failed to load {record['repo_id']}: {record['error']}"
+                    )
+                    continue
+                checkpoint.write(record["repo_id"] + "\n")
+                checkpoint.flush()
+                counts["loaded"] += 1
+
+        pending = set()
+        for repo_id in repo_ids:
+            if repo_id in done:
+                counts["skipped"] += 1
+                continue
+            done.add(repo_id)
+            pending.add(
+                executor.submit(_crawl_one, repo_id, rate_limiter, repo_type, token)
+            )
+            # Keep a bounded number of repos in flight.
+            if len(pending) >= 2 * max_workers:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write(finished)
+        write(pending)
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Load many repo cards and stream their metadata to a JSONL file."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "listing",
+        nargs="?",
+        help="File listing repo ids, one per line, or JSONL records with an `id` key.",
+    )
+    source.add_argument("--org", help="Crawl all the model repos of this org.")
+    parser.add_argument("--output", required=True, help="JSONL file to append to.")
+    parser.add_argument("--checkpoint", help="Defaults to <output>.checkpoint.")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--rate", type=float, default=None, help="Max requests per second per host."
+    )
+    parser.add_argument("--repo-type", default=None)
+    parser.add_argument("--token", default=None)
+    args = parser.parse_args(argv)
+
+    if args.org:
+        repo_ids = list_org_repo_ids(args.org, token=args.token)
+    else:
+        repo_ids = read_repo_ids(args.listing)
+    counts = crawl(
+        repo_ids,
+        args.output,
+        checkpoint_path=args.checkpoint,
+        max_workers=args.workers,
+        rate=args.rate,
+        repo_type=args.repo_type,
+        token=args.token,
+    )
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
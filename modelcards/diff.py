@@ -0,0 +1,344 @@
+"""Structured diffs between cards, to preview what a `push_to_hub` would change.
+
+`diff_cards` compares two cards field by field: metadata keys, eval results matched by
+identity (see `CardData.merge_eval_results`) and a line diff of the Markdown body.
+Cards with equal fingerprints are reported as unchanged without comparing anything
+else.
+
+`diff_tree` compares a local tree of cards against cached copies of the remote cards
+in parallel, and reports which repos actually need to be pushed.
+
+Example:
+    Compare the cards in `cards/<repo_id>/README.md` to the copies cached in
+    `remote.mcpk` (see `modelcards.corpus`):
+
+        modelcards-diff cards remote.mcpk --workers 8
+"""
+
+import argparse
+import difflib
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .card_data import (
+    CardData,
+    EvalResult,
+    _eval_result_identity,
+    _update_digest,
+)
+from .cards import RepoCard
+from .corpus import MAGIC as CORPUS_MAGIC
+from .corpus import CorpusReader
+
+
+@dataclass
+class CardDiff:
+    """The changes between an old and a new card.
+
+    Args:
+        metadata (`Dict[str, Tuple[Any, Any]]`):
+            The metadata keys whose value changed, mapped to their old and new value.
+            A value of `None` means the key is not set.
+        eval_results_added (`List[EvalResult]`):
+            Eval results of the new card whose identity is not in the old card.
+        eval_results_removed (`List[EvalResult]`):
+            Eval results of the old card whose identity is not in the new card.
+        eval_results_updated (`List[Tuple[EvalResult, EvalResult]]`):
+            Old and new eval results with the same identity but different values.
+        body (`List[str]`):
+            Unified diff lines of the Markdown body. Empty if the body is unchanged.
+    """
+
+    metadata: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    eval_results_added: List[EvalResult] = field(default_factory=list)
+    eval_results_removed: List[EvalResult] = field(default_factory=list)
+    eval_results_updated: List[Tuple[EvalResult, EvalResult]] = field(
+        default_factory=list
+    )
+    body: List[str] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(
+            self.metadata
+            or self.eval_results_added
+            or self.eval_results_removed
+            or self.eval_results_updated
+            or self.body
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a compact, JSON serializable summary of the changes: the changed
+        metadata keys with their values, and the number of changed eval results and
+        body lines."""
+        summary = {}
+        if self.metadata:
+            summary["metadata"] = {k: list(v) for k, v in self.metadata.items()}
+        if (
+            self.eval_results_added
+            or self.eval_results_removed
+            or self.eval_results_updated
+        ):
+            summary["eval_results"] = {
+                "added": len(self.eval_results_added),
+                "removed": len(self.eval_results_removed),
+                "updated": len(self.eval_results_updated),
+            }
+        if self.body:
+            summary["body"] = {
+                "added_lines": sum(
+                    1 for line in self.body if line[:1] == "+" and line[:3] != "+++"
+                ),
+                "removed_lines": sum(
+                    1 for line in self.body if line[:1] == "-" and line[:3] != "---"
+                ),
+            }
+        return summary
+
+
+def _metadata(data: CardData) -> Dict[str, Any]:
+    return {
+        k: v
+        for k, v in data.__dict__.items()
+        if k != "eval_results" and not k.startswith("_") and v is not None
+    }
+
+
+def _digest(value: Any) -> bytes:
+    # The canonical encoding of `CardData.fingerprint`, which tells apart values that
+    # compare equal but are dumped differently, such as 1 and 1.0.
+    h = hashlib.blake2b(digest_size=16)
+    _update_digest(h, value)
+    return h.digest()
+
+
+def _diff_eval_results(old: List[EvalResult], new: List[EvalResult], diff: CardDiff):
+    old_by_identity: Dict[Tuple, List[EvalResult]] = {}
+    for eval_result in old:
+        old_by_identity.setdefault(_eval_result_identity(eval_result), []).append(
+            eval_result
+        )
+    for eval_result in new:
+        # Results sharing an identity are paired up in order.
+        same_identity = old_by_identity.get(_eval_result_identity(eval_result))
+        if not same_identity:
+            diff.eval_results_added.append(eval_result)
+            continue
+        old_result = same_identity.pop(0)
+        if old_result.fingerprint() != eval_result.fingerprint():
+            diff.eval_results_updated.append((old_result, eval_result))
+    for remaining in old_by_identity.values():
+        diff.eval_results_removed.extend(remaining)
+
+
+def diff_cards(old: RepoCard, new: RepoCard, context: int = 3) -> CardDiff:
+    """Computes the structured diff between two cards.
+
+    Args:
+        old (`modelcards.RepoCard`):
+            The card before the changes, such as the remote copy.
+        new (`modelcards.RepoCard`):
+            The card after the changes, such as the local copy.
+        context (`int`, *optional*):
+            Number of context lines of the body diff. Defaults to 3.
+
+    Returns:
+        `modelcards.diff.CardDiff`: The changes, which is falsy if there are none.
+
+    Example:
+        >>> from modelcards import RepoCard
+        >>> from modelcards.diff import diff_cards
+        >>> old = RepoCard("---\\nlicense: mit\\n---\\n# My model\\n")
+        >>> new = RepoCard("---\\nlicense: apache-2.0\\n---\\n# My model\\n")
+        >>> diff_cards(old, new).to_dict()
+        {'metadata': {'license': ['mit', 'apache-2.0']}}
+    """
+    diff = CardDiff()
+    if old.fingerprint() == new.fingerprint():
+        return diff
+
+    if old.data.fingerprint() != new.data.fingerprint():
+        old_metadata, new_metadata = _metadata(old.data), _metadata(new.data)
+        for key in old_metadata.keys() | new_metadata.keys():
+            old_value, new_value = old_metadata.get(key), new_metadata.get(key)
+            if _digest(old_value) != _digest(new_value):
+                diff.metadata[key] = (old_value, new_value)
+        diff.metadata = dict(sorted(diff.metadata.items()))
+        _diff_eval_results(
+            old.data.eval_results or [], new.data.eval_results or [], diff
+        )
+
+    old_text, new_text = old.text, new.text
+    if old_text != new_text:
+        diff.body = list(
+            difflib.unified_diff(
+                old_text.splitlines(keepends=True),
+                new_text.splitlines(keepends=True),
+                fromfile="old",
+                tofile="new",
+                n=context,
+            )
+        )
+    return diff
+
+
+def _iter_repo_ids(local_dir: Path) -> Iterator[str]:
+    for path in local_dir.rglob("README.md"):
+        yield path.parent.relative_to(local_dir).as_posix()
+
+
+# The remote corpus of a worker process. It is opened once per worker, so its index of
+# repo ids is only built once rather than for every batch.
+_worker_reader: Optional[CorpusReader] = None
+
+
+def _init_worker(remote: str):
+    global _worker_reader
+    if Path(remote).is_file():
+        _worker_reader = CorpusReader(remote)
+
+
+def _diff_batch(
+    local_dir: str,
+    remote: str,
+    repo_ids: List[str],
+    reader: Optional[CorpusReader] = None,
+) -> List[Tuple[str, str, Any]]:
+    if reader is None:
+        reader = _worker_reader
+    results = []
+    for repo_id in repo_ids:
+        try:
+            new = RepoCard.load(Path(local_dir) / repo_id / "README.md")
+            if reader is not None:
+                old = reader[repo_id] if repo_id in reader else None
+            else:
+                old_path = Path(remote) / repo_id / "README.md"
+                old = RepoCard.load(old_path) if old_path.exists() else None
+            if old is None:
+                results.append((repo_id, "new", None))
+                continue
+            diff = diff_cards(old, new)
+            if diff:
+                results.append((repo_id, "changed", diff.to_dict()))
+            else:
+                results.append((repo_id, "unchanged", None))
+        except Exception as exc:
+            results.append((repo_id, "error", f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+def diff_tree(
+    local_dir: Union[str, Path],
+    remote: Union[str, Path],
+    num_workers: Optional[int] = None,
+    batch_size: int = 100,
+) -> Dict[str, Any]:
+    """Compares every card of a local tree against the cached copy of its remote card,
+    in parallel.
+
+    Args:
+        local_dir (`Union[str, Path]`):
+            A directory holding the local cards as `<repo_id>/README.md`.
+        remote (`Union[str, Path]`):
+            The cached remote cards, either as a directory with the same layout as
+            `local_dir` or as a packed corpus file keyed by repo id (see
+            `modelcards.corpus.CorpusWriter`).
+        num_workers (`int`, *optional*):
+            Number of worker processes. Defaults to the number of CPUs. Use 0 to
+            compare cards in the current process.
+        batch_size (`int`, *optional*):
+            Number of cards compared per task. Defaults to 100.
+
+    Returns:
+        `Dict[str, Any]`: A report with the following keys:
+            - `changed`: the repo ids whose card changed, mapped to
+              `CardDiff.to_dict()`.
+            - `new`: the repo ids with no remote copy.
+            - `errors`: the repo ids whose card could not be loaded, mapped to the
+              error.
+            - `unchanged`: the number of unchanged cards.
+        Only the repos in `changed` and `new` need to be pushed.
+    """
+    local_dir, remote = Path(local_dir), Path(remote)
+    if not local_dir.is_dir():
+        raise ValueError(f"'{local_dir}' is not a directory.")
+    if not remote.exists():
+        raise ValueError(f"'{remote}' does not exist.")
+    if remote.is_file():
+        with open(remote, "rb") as f:
+            if f.read(len(CORPUS_MAGIC)) != CORPUS_MAGIC:
+                raise ValueError(f"'{remote}' is not a packed card corpus.")
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    repo_ids = _iter_repo_ids(local_dir)
+    batches = iter(lambda: list(itertools.islice(repo_ids, batch_size)), [])
+    diff_batch = partial(_diff_batch, str(local_dir), str(remote))
+    reader = None
+    if num_workers == 0:
+        reader = CorpusReader(remote) if remote.is_file() else None
+        results = map(partial(diff_batch, reader=reader), batches)
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(str(remote),),
+        )
+        results = executor.map(diff_batch, batches)
+
+    report = {"changed": {}, "new": [], "errors": {}, "unchanged": 0}
+    try:
+        for batch in results:
+            for repo_id, status, value in batch:
+                if status == "changed":
+                    report["changed"][repo_id] = value
+                elif status == "new":
+                    report["new"].append(repo_id)
+                elif status == "error":
+                    report["errors"][repo_id] = value
+                else:
+                    report["unchanged"] += 1
+    finally:
+        if num_workers != 0:
+            executor.shutdown()
+        elif reader is not None:
+            reader.close()
+
+    report["changed"] = dict(sorted(report["changed"].items()))
+    report["new"].sort()
+    report["errors"] = dict(sorted(report["errors"].items()))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare local cards against cached copies of the remote cards."
+    )
+    parser.add_argument("local_dir", help="Directory of <repo_id>/README.md files.")
+    parser.add_argument(
+        "remote", help="Directory or packed corpus file of the remote cards."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Defaults to the number of CPUs."
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    report = diff_tree(
+        args.local_dir,
+        args.remote,
+        num_workers=args.workers,
+        batch_size=args.batch_size,
+    )
+    print(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""Streaming export of card metadata to tabular files.
+
+Cards are read from a directory of README.md files, a list of README.md paths or a
+packed corpus file (see `modelcards.corpus`), parsed in batches by a pool of worker
+processes, and written to two tables as each batch comes back:
+
+    - `cards`: one row per card, with its `CardData` fields.
+    - `eval_results`: one row per eval result, flattened from the `model-index`.
+
+Only a bounded number of batches are in flight at any time, so memory use depends on
+the batch size and number of workers, not on the size of the corpus.
+
+Tables are written as JSON Lines, or as Parquet row groups or Arrow record batches
+if `pyarrow` is installed (`pip install modelcards[export]`).
+
+Example:
+    Export a packed corpus to Parquet with 8 workers:
+
+        modelcards-export cards.mcpk --output-dir tables --format parquet --workers 8
+"""
+
+import argparse
+import inspect
+import itertools
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .card_data import CardData
+from .cards import RepoCard
+from .corpus import MAGIC as CORPUS_MAGIC
+from .corpus import CorpusReader
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ["jsonl", "parquet", "arrow"]
+
+# Columns of the `cards` table. CardData fields not listed here are stored as a JSON
+# object in `extra`.
+CARD_COLUMNS = [
+    "repo_id",
+    "language",
+    "license",
+    "library_name",
+    "tags",
+    "datasets",
+    "metrics",
+    "model_name",
+    "num_eval_results",
+    "extra",
+    "error",
+]
+# Columns of the `eval_results` table. `*_args` and `metric_config` are stored as JSON,
+# and `metric_value` as a float, next to its original value in `metric_value_raw`.
+EVAL_RESULT_COLUMNS = [
+    "repo_id",
+    "model_name",
+    "task_type",
+    "task_name",
+    "dataset_type",
+    "dataset_name",
+    "dataset_config",
+    "dataset_split",
+    "dataset_revision",
+    "dataset_args",
+    "metric_type",
+    "metric_name",
+    "metric_config",
+    "metric_args",
+    "metric_value",
+    "metric_value_raw",
+    "verified",
+]
+
+_LIST_COLUMNS = ("language", "tags", "datasets", "metrics")
+# The CardData fields with a column of their own, which are not stored in `extra`.
+_KNOWN_FIELDS = {
+    name
+    for name, param in inspect.signature(CardData.__init__).parameters.items()
+    if name != "self" and param.kind is param.POSITIONAL_OR_KEYWORD
+}
+
+Rows = Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+def _as_list(value) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if not isinstance(value, list):
+        value = [value]
+    return [str(v) for v in value]
+
+
+def _as_str(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _as_json(value) -> Optional[str]:
+    return None if value is None else json.dumps(value, sort_keys=True, default=str)
+
+
+def _as_float(value) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def card_data_to_rows(repo_id: str, data: CardData) -> Rows:
+    """Flattens the metadata of a card to a `cards` row and `eval_results` rows.
+
+    List-like fields are normalized to lists of strings, `metric_value` to a float
+    (`None` if it isn't a number, such as `"20.0 ± 1.2"`, in which case its original
+    value is still found in `metric_value_raw`), and unknown fields and arguments to
+    JSON strings, so every row of a table has the same types.
+
+    Args:
+        repo_id (`str`):
+            The id stored in the `repo_id` column of the rows.
+        data (`modelcards.CardData`):
+            The metadata of the card.
+
+    Returns:
+        `Tuple[List[dict], List[dict]]`: The `cards` rows (a single row) and the
+        `eval_results` rows of the card.
+    """
+    d = data.__dict__
+    eval_results = data.eval_results or []
+    card_row = {
+        "repo_id": repo_id,
+        "language": _as_list(data.language),
+        "license": _as_str(data.license),
+        "library_name": _as_str(data.library_name),
+        "tags": _as_list(data.tags),
+        "datasets": _as_list(data.datasets),
+        "metrics": _as_list(data.metrics),
+        "model_name": _as_str(data.model_name),
+        "num_eval_results": len(eval_results),
+        "extra": _as_json(
+            {
+                k: v
+                for k, v in d.items()
+                if k not in _KNOWN_FIELDS and not k.startswith("_") and v is not None
+            }
+            or None
+        ),
+        "error": None,
+    }
+    eval_rows = []
+    for r in eval_results:
+        eval_rows.append(
+            {
+                "repo_id": repo_id,
+                "model_name": card_row["model_name"],
+                "task_type": _as_str(r.task_type),
+                "task_name": _as_str(r.task_name),
+                "dataset_type": _as_str(r.dataset_type),
+                "dataset_name": _as_str(r.dataset_name),
+                "dataset_config": _as_str(r.dataset_config),
+                "dataset_split": _as_str(r.dataset_split),
+                "dataset_revision": _as_str(r.dataset_revision),
+                "dataset_args": _as_json(r.dataset_args),
+                "metric_type": _as_str(r.metric_type),
+                "metric_name": _as_str(r.metric_name),
+                "metric_config": _as_json(r.metric_config),
+                "metric_args": _as_json(r.metric_args),
+                "metric_value": _as_float(r.metric_value),
+                "metric_value_raw": _as_str(r.metric_value),
+                "verified": r.verified if isinstance(r.verified, bool) else None,
+            }
+        )
+    return [card_row], eval_rows
+
+
+def _error_row(repo_id: str, exc: Exception) -> Dict[str, Any]:
+    row = dict.fromkeys(CARD_COLUMNS)
+    row.update(
+        repo_id=repo_id, num_eval_results=0, error=f"{type(exc).__name__}: {exc}"
+    )
+    return row
+
+
+def _parse_files(items: List[Tuple[str, str]]) -> Rows:
+    card_rows, eval_rows = [], []
+    for repo_id, path in items:
+        try:
+            data = RepoCard(Path(path).read_text(encoding="utf-8")).data
+            cards, evals = card_data_to_rows(repo_id, data)
+        except Exception as exc:
+            cards, evals = [_error_row(repo_id, exc)], []
+        card_rows += cards
+        eval_rows += evals
+    return card_rows, eval_rows
+
+
+def _parse_corpus(path: str, start: int, stop: int) -> Rows:
+    card_rows, eval_rows = [], []
+    with CorpusReader(path) as reader:
+        for i in range(start, stop):
+            repo_id = reader.repo_id(i)
+            try:
+                # Only the metadata region of the corpus is read.
+                cards, evals = card_data_to_rows(repo_id, reader.metadata(i))
+            except Exception as exc:
+                cards, evals = [_error_row(repo_id, exc)], []
+            card_rows += cards
+            eval_rows += evals
+    return card_rows, eval_rows
+
+
+def _is_corpus(path: Path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(CORPUS_MAGIC)) == CORPUS_MAGIC
+
+
+def _iter_tasks(
+    source: Union[str, Path, Iterable[Union[str, Path]]], batch_size: int
+) -> Iterator[tuple]:
+    """Yields `(function, *args)` tasks, each parsing a batch of cards."""
+    if isinstance(source, (str, Path)) and Path(source).is_file():
+        with CorpusReader(source) as reader:
+            count = len(reader)
+        for start in range(0, count, batch_size):
+            yield _parse_corpus, str(source), start, min(start + batch_size, count)
+        return
+
+    if isinstance(source, (str, Path)):
+        root = Path(source)
+        items = (
+            (path.parent.relative_to(root).as_posix(), str(path))
+            for path in root.rglob("README.md")
+        )
+    else:
+        items = ((str(path), str(path)) for path in source)
+    while True:
+        batch = list(itertools.islice(items, batch_size))
+        if not batch:
+            return
+        yield _parse_files, batch
+
+
+class _JsonlWriter:
+    def __init__(self, path: Path, columns: List[str]):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._file.writelines(json.dumps(row) + "\n" for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Exporting to Parquet or Arrow requires `pyarrow`. Install it with"
+            " `pip install modelcards[export]`."
+        )
+    return pyarrow
+
+
+def _arrow_schema(columns: List[str]):
+    pa = _import_pyarrow()
+    types = {
+        "num_eval_results": pa.int64(),
+        "metric_value": pa.float64(),
+        "verified": pa.bool_(),
+    }
+    for name in _LIST_COLUMNS:
+        types[name] = pa.list_(pa.string())
+    return pa.schema([(name, types.get(name, pa.string())) for name in columns])
+
+
+class _ArrowWriter:
+    def __init__(self, path: Path, columns: List[str], file_format: str):
+        pa = _import_pyarrow()
+        self._schema = _arrow_schema(columns)
+        if file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(str(path), self._schema)
+        else:
+            self._writer = pa.ipc.new_file(str(path), self._schema)
+        self._pa = pa
+
+    def write(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        batch = self._pa.RecordBatch.from_pylist(rows, schema=self._schema)
+        # Each batch of cards becomes one Parquet row group / Arrow record batch.
+        if isinstance(self._writer, self._pa.ipc.RecordBatchFileWriter):
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write_table(self._pa.Table.from_batches([batch]))
+
+    def close(self):
+        self._writer.close()
+
+
+def _open_writer(path: Path, columns: List[str], file_format: str):
+    if file_format == "jsonl":
+        return _JsonlWriter(path, columns)
+    return _ArrowWriter(path, columns, file_format)
+
+
+def export_cards(
+    source: Union[str, Path, Iterable[Union[str, Path]]],
+    output_dir: Union[str, Path],
+    format: str = "jsonl",
+    batch_size: int = 1000,
+    num_workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """Parses a corpus of cards and streams their metadata to a `cards` table and a
+    flattened `eval_results` table (see `card_data_to_rows` for the columns).
+
+    Args:
+        source (`Union[str, Path, Iterable[Union[str, Path]]]`):
+            A packed corpus file written by `modelcards.corpus.CorpusWriter`, a
+            directory searched recursively for README.md files (the repo id of each
+            card is its folder, relative to the directory), or an iterable of README.md
+            paths (the repo id of each card is its path).
+        output_dir (`Union[str, Path]`):
+            The directory to write `cards.<format>` and `eval_results.<format>` to.
+        format (`str`, *optional*):
+            One of "jsonl", "parquet" or "arrow". Defaults to "jsonl". "parquet" and
+            "arrow" require `pyarrow`.
+        batch_size (`int`, *optional*):
+            Number of cards parsed per task, which is also the number of cards per
+            Parquet row group or Arrow record batch. Defaults to 1000.
+        num_workers (`int`, *optional*):
+            Number of worker processes parsing cards. Defaults to the number of CPUs.
+            Use 0 to parse cards in the current process.
+
+    Returns:
+        `Dict[str, int]`: The number of `cards` and `eval_results` rows written, and
+        the number of cards that could not be parsed (`errors`), which are still
+        written to the `cards` table with their `error` set.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Provided format '{format}' should be one of {FORMATS}.")
+    if batch_size < 1:
+        raise ValueError("`batch_size` should be at least 1.")
+    if isinstance(source, (str, Path)):
+        if not Path(source).exists():
+            raise ValueError(f"'{source}' does not exist.")
+        if Path(source).is_file() and not _is_corpus(Path(source)):
+            raise ValueError(f"'{source}' is not a packed card corpus.")
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    counts = {"cards": 0, "eval_results": 0, "errors": 0}
+    tasks = _iter_tasks(source, batch_size)
+
+    writers = []
+    try:
+        writers.append(
+            _open_writer(output_dir / f"cards.{format}", CARD_COLUMNS, format)
+        )
+        writers.append(
+            _open_writer(
+                output_dir / f"eval_results.{format}", EVAL_RESULT_COLUMNS, format
+            )
+        )
+        cards_writer, eval_results_writer = writers
+
+        def write(rows: Rows):
+            card_rows, eval_rows = rows
+            cards_writer.write(card_rows)
+            eval_results_writer.write(eval_rows)
+            counts["cards"] += len(card_rows)
+            counts["eval_results"] += len(eval_rows)
+            counts["errors"] += sum(row["error"] is not None for row in card_rows)
+
+        if num_workers == 0:
+            for fn, *args in tasks:
+                write(fn(*args))
+        else:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                # Batches are written in order, with a bounded number in flight.
+                pending = deque()
+                for fn, *args in tasks:
+                    pending.append(executor.submit(fn, *args))
+                    if len(pending) >= 2 * num_workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    finally:
+        for writer in writers:
+            writer.close()
+
+    if counts["errors"]:
+        logger.warning(f"{counts['errors']} cards could not be parsed.")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Export the metadata of a corpus of cards to tabular files."
+    )
+    parser.add_argument(
+        "source", help="A packed corpus file or a directory of README.md files."
+    )
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Defaults to the number of CPUs."
+    )
+    args = parser.parse_args(argv)
+
+    counts = export_cards(
+        args.source,
+        args.output_dir,
+        format=args.format,
+        batch_size=args.batch_size,
+        num_workers=args.workers,
+    )
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
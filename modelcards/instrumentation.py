@@ -0,0 +1,217 @@
+"""Timing and size instrumentation for the hot paths of modelcards.
+
+The following spans are emitted:
+    - `parse`: `RepoCard.__init__`, bytes of the card content.
+    - `to_yaml`: `CardData.to_yaml`, bytes of the YAML block.
+    - `render`: template rendering in `ModelCard.from_template`, bytes of the
+      rendered card.
+    - `validate`: `RepoCard.validate`, bytes sent for validation.
+    - `upload`: the upload in `RepoCard.push_to_hub`, bytes uploaded.
+
+When no callback is registered, `span` returns a shared no-op object, so the cost of
+instrumentation is a single function call per span.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_callbacks = ()
+_callbacks_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("name", "start_time_ns", "duration_ns", "error", "_payload", "_t0")
+
+    def __init__(self, name: str):
+        """A single timed operation, passed to span callbacks once it has ended.
+
+        Attributes:
+            name (`str`): The name of the operation, such as `"parse"`.
+            start_time_ns (`int`): Wall clock time the span started at, in nanoseconds
+                since the epoch.
+            duration_ns (`int`): Duration of the span in nanoseconds.
+            error (`BaseException`, *optional*): The exception raised inside the span,
+                if any.
+        """
+        self.name = name
+        self.start_time_ns = 0
+        self.duration_ns = 0
+        self.error = None
+        self._payload = None
+
+    def record_bytes(self, payload: Union[str, bytes]):
+        """Records the payload processed by this span. Its size is only computed if a
+        callback asks for `nbytes`."""
+        self._payload = payload
+
+    @property
+    def nbytes(self) -> Optional[int]:
+        """Size of the recorded payload in bytes (UTF-8 for strings), if any."""
+        if isinstance(self._payload, str):
+            return len(self._payload.encode("utf-8"))
+        if self._payload is not None:
+            return len(self._payload)
+        return None
+
+    def __enter__(self):
+        self.start_time_ns = time.time_ns()
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self._t0
+        self.error = exc
+        for callback in _callbacks:
+            try:
+                callback(self)
+            except Exception:
+                logger.exception(f"Span callback {callback!r} failed.")
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def record_bytes(self, payload):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    """Returns a context manager timing the operation `name`. If no callback is
+    registered, a shared no-op span is returned instead."""
+    if not _callbacks:
+        return _NULL_SPAN
+    return Span(name)
+
+
+def add_span_callback(callback: Callable[[Span], Any]):
+    """Registers `callback` to be called with every `modelcards.instrumentation.Span`
+    once it ends.
+
+    Example:
+        >>> from modelcards import CardData
+        >>> from modelcards.instrumentation import add_span_callback, remove_span_callback
+        >>> names = []
+        >>> callback = lambda span: names.append(span.name)
+        >>> add_span_callback(callback)
+        >>> _ = CardData(license="mit").to_yaml()
+        >>> remove_span_callback(callback)
+        >>> names
+        ['to_yaml']
+    """
+    global _callbacks
+    # The tuple is replaced rather than mutated, so spans ending in other threads
+    # always iterate over a consistent set of callbacks. The lock only serializes
+    # registrations.
+    with _callbacks_lock:
+        _callbacks = _callbacks + (callback,)
+
+
+def remove_span_callback(callback: Callable[[Span], Any]):
+    """Unregisters a callback added with `add_span_callback`. Callbacks are compared
+    with `==`, so a bound method such as `spans.append` matches the one registered.
+    If `callback` was registered several times, only one registration is removed."""
+    global _callbacks
+    with _callbacks_lock:
+        callbacks = list(_callbacks)
+        if callback in callbacks:
+            callbacks.remove(callback)
+            _callbacks = tuple(callbacks)
+
+
+class StatsCollector:
+    def __init__(self):
+        """Aggregates the count, time and bytes of spans by name.
+
+        It can be used as a context manager to register it as a span callback for the
+        duration of a block.
+
+        Example:
+            >>> from modelcards import CardData
+            >>> from modelcards.instrumentation import StatsCollector
+            >>> with StatsCollector() as stats:
+            ...     _ = CardData(license="mit").to_yaml()
+            >>> stats.summary()["to_yaml"]["count"]
+            1
+        """
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def __call__(self, span: Span):
+        nbytes = span.nbytes
+        with self._lock:
+            stats = self._stats.get(span.name)
+            if stats is None:
+                stats = self._stats[span.name] = {
+                    "count": 0,
+                    "errors": 0,
+                    "total_ns": 0,
+                    "max_ns": 0,
+                    "bytes": 0,
+                }
+            stats["count"] += 1
+            stats["errors"] += span.error is not None
+            stats["total_ns"] += span.duration_ns
+            stats["max_ns"] = max(stats["max_ns"], span.duration_ns)
+            stats["bytes"] += nbytes or 0
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Returns a copy of the collected stats, keyed by span name. Each entry has
+        `count`, `errors`, `total_ns`, `max_ns` and `bytes` keys."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def reset(self):
+        """Clears the collected stats."""
+        with self._lock:
+            self._stats.clear()
+
+    def __enter__(self):
+        add_span_callback(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        remove_span_callback(self)
+        return False
+
+
+def opentelemetry_callback(tracer) -> Callable[[Span], None]:
+    """Returns a span callback forwarding spans to an OpenTelemetry tracer.
+
+    Args:
+        tracer (`opentelemetry.trace.Tracer`):
+            The tracer used to create the spans, as returned by
+            `opentelemetry.trace.get_tracer(...)`. Spans are named `modelcards.<name>`
+            and carry a `modelcards.bytes` attribute.
+
+    Returns:
+        `Callable`: A callback to register with `add_span_callback`.
+    """
+
+    def callback(span: Span):
+        attributes = {}
+        if span.nbytes is not None:
+            attributes["modelcards.bytes"] = span.nbytes
+        otel_span = tracer.start_span(
+            f"modelcards.{span.name}",
+            start_time=span.start_time_ns,
+            attributes=attributes,
+        )
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+        otel_span.end(end_time=span.start_time_ns + span.duration_ns)
+
+    return callback
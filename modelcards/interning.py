@@ -0,0 +1,135 @@
+import sys
+import threading
+from dataclasses import fields
+from typing import Any, Dict, List
+
+from .card_data import CardData, EvalResult, FrozenCardData, _FrozenEvalResult
+
+
+class InternPool:
+    def __init__(self):
+        """A pool of shared string values that can be used when loading many cards.
+
+        Card metadata repeats the same strings over and over (task types, dataset
+        types, metric types, license ids, tags, ...). Passing loaded values through
+        an `InternPool` makes every equal string point to a single shared object,
+        so only one copy of each is kept alive.
+
+        A pool can be shared by threads loading cards concurrently. Lookups take no
+        lock (`dict.setdefault` is atomic), and each thread keeps its own counters, so
+        threads sharing a pool don't serialize on it.
+
+        Example:
+            >>> from modelcards.interning import InternPool
+            >>> pool = InternPool()
+            >>> a = pool.intern("".join(["image-", "classification"]))
+            >>> b = pool.intern("".join(["image-", "classification"]))
+            >>> a is b
+            True
+            >>> pool.memory_report()["hits"]
+            1
+        """
+        self._pool: Dict[str, str] = {}
+        # Guards the list of per-thread counters, not the lookups.
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_counters: List[List[int]] = []
+
+    def __len__(self):
+        return len(self._pool)
+
+    def __contains__(self, value):
+        return value in self._pool
+
+    def intern(self, value: Any) -> Any:
+        """Returns the pooled copy of `value` if it is a string, adding it to the pool
+        if it is not there yet. Other values are returned unchanged."""
+        if type(value) is not str:
+            return value
+        # Lookups, hits and duplicate bytes of the current thread.
+        counters = getattr(self._local, "counters", None)
+        if counters is None:
+            counters = self._local.counters = [0, 0, 0]
+            with self._lock:
+                self._thread_counters.append(counters)
+        counters[0] += 1
+        pooled = self._pool.setdefault(value, value)
+        if pooled is not value:
+            counters[1] += 1
+            counters[2] += sys.getsizeof(value)
+        return pooled
+
+    def intern_value(self, obj: Any) -> Any:
+        """Recursively interns the strings found in `obj`.
+
+        Lists and dicts are updated in place, as are the fields of `EvalResult` and
+        `CardData` instances. `FrozenCardData` can't be updated, so it is returned
+        as is. The (possibly pooled) value is returned.
+        """
+        if type(obj) is str:
+            return self.intern(obj)
+        elif isinstance(obj, list):
+            for i, item in enumerate(obj):
+                obj[i] = self.intern_value(item)
+        elif isinstance(obj, dict):
+            items = [(self.intern(k), self.intern_value(v)) for k, v in obj.items()]
+            obj.clear()
+            obj.update(items)
+        elif isinstance(obj, (FrozenCardData, _FrozenEvalResult)):
+            return obj
+        elif isinstance(obj, EvalResult):
+            for field in fields(obj):
+                setattr(obj, field.name, self.intern_value(getattr(obj, field.name)))
+        elif isinstance(obj, CardData):
+            self.intern_value(obj.__dict__)
+        return obj
+
+    def _counters(self) -> List[int]:
+        with self._lock:
+            return [sum(c) for c in zip([0, 0, 0], *self._thread_counters)]
+
+    @property
+    def lookups(self) -> int:
+        return self._counters()[0]
+
+    @property
+    def hits(self) -> int:
+        return self._counters()[1]
+
+    @property
+    def duplicate_bytes(self) -> int:
+        return self._counters()[2]
+
+    def memory_report(self) -> Dict[str, int]:
+        """Reports on the pool's contents and the duplicate strings it has seen so far.
+        While other threads are interning strings, the report is approximate.
+
+        Returns:
+            `dict`: With the following keys:
+                - `unique_strings`: number of distinct strings in the pool.
+                - `pooled_bytes`: memory held by the pooled strings.
+                - `lookups`: number of strings passed through the pool.
+                - `hits`: number of lookups that found an equal pooled string.
+                - `duplicate_bytes`: memory of the duplicate strings that were replaced
+                  by a pooled copy. This is an upper bound of the memory saved:
+                  duplicates that are not kept (such as the strings of the parsed
+                  `model-index`, which is dropped once converted to eval results)
+                  would have been freed anyway.
+        """
+        lookups, hits, duplicate_bytes = self._counters()
+        # Copied first, as other threads may add strings while they are measured.
+        pooled = list(self._pool)
+        return {
+            "unique_strings": len(pooled),
+            "pooled_bytes": sum(sys.getsizeof(s) for s in pooled),
+            "lookups": lookups,
+            "hits": hits,
+            "duplicate_bytes": duplicate_bytes,
+        }
+
+    def clear(self):
+        """Removes all strings from the pool and resets its counters."""
+        with self._lock:
+            self._pool.clear()
+            for counters in self._thread_counters:
+                counters[:] = [0, 0, 0]
@@ -0,0 +1,311 @@
+"""Heading index and cheap edits over the Markdown body of a card.
+
+`SectionIndex` splits a Markdown text into sections, one per ATX heading (`#` to
+`######`), ignoring anything inside fenced code blocks. Sections are flat: a section
+runs from its heading to the next heading of any level, so editing a section never
+touches its subsections.
+
+Sections are kept in a linked list of pieces and indexed by title, so looking a
+section up is O(1) and inserting text only scans the inserted text. Text inserted into
+a section is kept as a separate chunk of its body, and the full text is joined once,
+when it is next read.
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+REGEX_HEADING = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+REGEX_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+
+class Section:
+    __slots__ = (
+        "level",
+        "title",
+        "heading",
+        "start",
+        "_chunks",
+        "_fence",
+        "_prev",
+        "_next",
+    )
+
+    def __init__(self, level: int, title: Optional[str], heading: str, body: str):
+        """A heading and the text up to the next heading.
+
+        Attributes:
+            level (`int`): The heading level, from 1 to 6. `0` for the text before the
+                first heading.
+            title (`str`, *optional*): The heading's text, without the `#` markers.
+                `None` for the text before the first heading.
+            heading (`str`): The heading line, including its line break.
+            body (`str`): The text following the heading, up to the next heading.
+            start (`int`, *optional*): Offset of the section in the text the index was
+                built from. `None` for sections added by edits.
+        """
+        self.level = level
+        self.title = title
+        self.heading = heading
+        self.body = body
+        self.start = None
+        # The code fence still open at the end of the body, if any.
+        self._fence: Optional[str] = None
+        self._prev = self._next = None
+
+    @property
+    def body(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @body.setter
+    def body(self, body: str):
+        self._chunks = [body] if body else []
+
+    def _extend(self, text: str, fence: Optional[str]):
+        """Appends `text` to the body, as a chunk joined when the body is next read."""
+        if text:
+            self._chunks.append(text)
+        self._fence = fence
+
+    def _ends_with_line_break(self) -> bool:
+        return not self._chunks or self._chunks[-1].endswith("\n")
+
+    @property
+    def text(self) -> str:
+        return self.heading + self.body
+
+    def __repr__(self):
+        return f"Section(level={self.level}, title={self.title!r})"
+
+
+def _parse(
+    text: str, offset: Optional[int] = 0, fence: Optional[str] = None
+) -> List[Section]:
+    """Splits `text` into sections. The first section is always the (possibly empty)
+    text before the first heading. `fence` is the code fence open at the start of
+    `text`, if any."""
+    sections = [Section(0, None, "", "")]
+    body: List[str] = []
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        stripped = line.rstrip("\r\n")
+        fence_match = REGEX_FENCE.match(stripped)
+        if fence is not None:
+            if (
+                fence_match
+                and fence_match.group(1)[0] == fence[0]
+                and len(fence_match.group(1)) >= len(fence)
+                and not stripped[fence_match.end() :].strip()
+            ):
+                fence = None
+        elif fence_match:
+            fence = fence_match.group(1)
+        else:
+            heading_match = REGEX_HEADING.match(stripped)
+            if heading_match:
+                sections[-1].body = "".join(body)
+                sections[-1]._fence = fence
+                body = []
+                title = (heading_match.group(2) or "").strip()
+                section = Section(len(heading_match.group(1)), title, line, "")
+                if offset is not None:
+                    section.start = offset + pos
+                sections.append(section)
+                pos += len(line)
+                continue
+        body.append(line)
+        pos += len(line)
+    sections[-1].body = "".join(body)
+    sections[-1]._fence = fence
+    if offset is not None:
+        sections[0].start = offset
+    return sections
+
+
+def _key(title: str) -> str:
+    match = REGEX_HEADING.match(title) if title.lstrip().startswith("#") else None
+    if match:
+        return (match.group(2) or "").strip()
+    return title.strip()
+
+
+class SectionIndex:
+    def __init__(self, text: str):
+        """Index the sections of a Markdown `text`.
+
+        Args:
+            text (`str`): The Markdown text, such as `RepoCard.text`.
+
+        Example:
+            >>> from modelcards.sections import SectionIndex
+            >>> sections = SectionIndex("# Title\\n\\n## Eval results\\n\\nTODO\\n\\n## Usage\\n")
+            >>> sections["Eval results"].body
+            '\\nTODO\\n\\n'
+            >>> sections.replace_body("Eval results", "\\n| acc | 0.9 |\\n\\n")
+            >>> sections.text
+            '# Title\\n\\n## Eval results\\n\\n| acc | 0.9 |\\n\\n## Usage\\n'
+        """
+        self._head = Section(0, None, "", "")
+        self._tail = Section(0, None, "", "")
+        self._head._next, self._tail._prev = self._tail, self._head
+        self._index: Dict[str, List[Section]] = {}
+        self._text: Optional[str] = text
+        self._modified = False
+        self._link_after(self._head, _parse(text))
+
+    def _link_after(self, node: Section, sections: List[Section]):
+        nxt = node._next
+        for section in sections:
+            section._prev, node._next = node, section
+            node = section
+            if section.title is not None:
+                self._index.setdefault(section.title, []).append(section)
+        node._next, nxt._prev = nxt, node
+
+    def _unlink(self, section: Section):
+        section._prev._next, section._next._prev = section._next, section._prev
+        if section.title is not None:
+            same_title = self._index[section.title]
+            same_title.remove(section)
+            if not same_title:
+                del self._index[section.title]
+
+    def _splice(self, section: Section, text: str):
+        """Replaces `section` with the sections parsed from `text`."""
+        prev = section._prev
+        self._unlink(section)
+        parsed = _parse(text, offset=None)
+        preamble = parsed.pop(0)
+        if preamble.body:
+            if prev is self._head:
+                parsed.insert(0, preamble)
+            else:
+                prev._extend(preamble.body, preamble._fence)
+        self._link_after(prev, parsed)
+        self._text = None
+        self._modified = True
+
+    def __iter__(self) -> Iterator[Section]:
+        node = self._head._next
+        while node is not self._tail:
+            yield node
+            node = node._next
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, title: str):
+        return _key(title) in self._index
+
+    def __getitem__(self, title: str) -> Section:
+        """Returns the first section titled `title`. The title can be given with or
+        without its `#` markers."""
+        sections = self.find_all(title)
+        if not sections:
+            raise KeyError(title)
+        return sections[0]
+
+    def get(self, title: str, default: Optional[Section] = None) -> Optional[Section]:
+        return self[title] if title in self else default
+
+    def find_all(self, title: str) -> List[Section]:
+        """Returns all the sections titled `title`, in document order."""
+        sections = self._index.get(_key(title), [])
+        if len(sections) > 1:
+            # Only duplicated titles need ordering, which requires a walk.
+            order = {id(section): i for i, section in enumerate(self)}
+            sections = sorted(sections, key=lambda s: order[id(s)])
+        return list(sections)
+
+    @property
+    def preamble(self) -> Optional[Section]:
+        """The text before the first heading, if any."""
+        first = self._head._next
+        return first if first is not self._tail and first.title is None else None
+
+    @property
+    def modified(self) -> bool:
+        """Whether the text was edited since the index was built."""
+        return self._modified
+
+    @property
+    def text(self) -> str:
+        """The full text, joined once after each batch of edits."""
+        if self._text is None:
+            self._text = "".join(piece for s in self for piece in (s.heading, s.body))
+        return self._text
+
+    def offset(self, title: str) -> Tuple[int, int]:
+        """Returns the start and end offsets of the first section titled `title` in
+        `SectionIndex.text`. This is O(1) until the first edit, then requires a walk."""
+        section = self[title]
+        if not self._modified:
+            return section.start, section.start + len(section.heading + section.body)
+        start = 0
+        for node in self:
+            if node is section:
+                return start, start + len(node.heading) + len(node.body)
+            start += len(node.heading) + len(node.body)
+
+    def replace_body(self, title: str, body: str):
+        """Replaces the body of the first section titled `title`, keeping its heading.
+        A line break is added to `body` if needed, so the next heading stays on its
+        own line."""
+        section = self[title]
+        self._splice(section, section.heading + self._terminate(section, body))
+
+    def replace(self, title: str, text: str):
+        """Replaces the first section titled `title`, heading included, with `text`."""
+        section = self[title]
+        self._splice(section, self._terminate(section, text))
+
+    def insert_before(self, title: str, text: str):
+        """Inserts `text` right before the heading of the first section titled
+        `title`."""
+        section = self[title]
+        if text and not text.endswith("\n"):
+            text += "\n"
+        prev = section._prev
+        parsed = _parse(text, offset=None, fence=prev._fence)
+        if parsed[-1]._fence is not None:
+            # The text leaves a code fence open, which turns the section's heading
+            # into code: re-parse them together.
+            self._splice(section, text + section.heading + section.body)
+            return
+        self._insert(prev, parsed)
+
+    def insert_after(self, title: str, text: str):
+        """Inserts `text` at the end of the first section titled `title`, before the
+        next heading."""
+        self._insert_after(self[title], text)
+
+    def append(self, text: str):
+        """Appends `text` at the end of the document."""
+        self._insert_after(self._tail._prev, text)
+
+    def _insert_after(self, section: Section, text: str):
+        if not section._ends_with_line_break():
+            section._extend("\n", section._fence)
+        text = self._terminate(section, text)
+        self._insert(section, _parse(text, offset=None, fence=section._fence))
+
+    def _insert(self, node: Section, parsed: List[Section]):
+        """Adds the text before the first heading of `parsed` to the body of `node`,
+        and links the other sections after it. Only the parsed text was scanned."""
+        preamble = parsed.pop(0)
+        if node is self._head:
+            if preamble.body:
+                parsed.insert(0, preamble)
+        else:
+            node._extend(preamble.body, preamble._fence)
+        self._link_after(node, parsed)
+        self._text = None
+        self._modified = True
+
+    def _terminate(self, section: Section, text: str) -> str:
+        """Adds a line break to `text` if it would otherwise run into the heading of
+        the section following `section`."""
+        if text and not text.endswith("\n") and section._next is not self._tail:
+            text += "\n"
+        return text
@@ -0,0 +1,237 @@
+"""Compact binary encoding for `CardData` and `EvalResult`.
+
+The format is a small, versioned, msgpack-style encoding. Every string is stored
+once in a table at the start of the payload and referenced by index afterwards,
+which keeps payloads of cards with many eval results (where task, dataset and metric
+identifiers repeat for every entry) much smaller than the equivalent pickle.
+
+Layout:
+    MAGIC (4 bytes) | VERSION (1 byte) | string table | root value
+
+The string table is a varint count followed by varint-length-prefixed UTF-8 strings.
+Values are a one byte tag followed by a tag-specific payload.
+"""
+
+import datetime
+import struct
+from dataclasses import fields
+from typing import Any, Dict, List, Optional
+
+from .card_data import CardData, EvalResult
+
+MAGIC = b"MCRD"
+VERSION = 1
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_INT = 3
+_TAG_FLOAT = 4
+_TAG_STR = 5
+_TAG_LIST = 6
+_TAG_DICT = 7
+_TAG_EVAL_RESULT = 8
+_TAG_CARD_DATA = 9
+_TAG_DATE = 10
+_TAG_DATETIME = 11
+
+_FLOAT = struct.Struct("<d")
+_EVAL_RESULT_FIELDS = tuple(f.name for f in fields(EvalResult))
+
+
+def _write_varint(out: bytearray, n: int):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.out = bytearray()
+
+    def string(self, s: str):
+        idx = self.strings.get(s)
+        if idx is None:
+            idx = self.strings[s] = len(self.strings)
+        self.out.append(_TAG_STR)
+        _write_varint(self.out, idx)
+
+    def value(self, obj: Any):
+        out = self.out
+        # bool must be checked before int, as bool is a subclass of int.
+        if obj is None:
+            out.append(_TAG_NONE)
+        elif obj is True:
+            out.append(_TAG_TRUE)
+        elif obj is False:
+            out.append(_TAG_FALSE)
+        elif isinstance(obj, str):
+            self.string(obj)
+        elif isinstance(obj, int):
+            out.append(_TAG_INT)
+            # Zigzag so small negative numbers stay small.
+            _write_varint(out, obj * 2 if obj >= 0 else -obj * 2 - 1)
+        elif isinstance(obj, float):
+            out.append(_TAG_FLOAT)
+            out += _FLOAT.pack(obj)
+        elif isinstance(obj, (list, tuple)):
+            out.append(_TAG_LIST)
+            _write_varint(out, len(obj))
+            for item in obj:
+                self.value(item)
+        elif isinstance(obj, dict):
+            out.append(_TAG_DICT)
+            self.mapping(obj)
+        elif isinstance(obj, EvalResult):
+            out.append(_TAG_EVAL_RESULT)
+            _write_varint(out, len(_EVAL_RESULT_FIELDS))
+            for name in _EVAL_RESULT_FIELDS:
+                self.value(getattr(obj, name))
+        elif isinstance(obj, CardData):
+            out.append(_TAG_CARD_DATA)
+            self.mapping(obj.__dict__)
+        elif isinstance(obj, datetime.datetime):
+            out.append(_TAG_DATETIME)
+            self.string(obj.isoformat())
+        elif isinstance(obj, datetime.date):
+            out.append(_TAG_DATE)
+            self.string(obj.isoformat())
+        else:
+            raise TypeError(f"Object of type {type(obj).__name__} cannot be encoded")
+
+    def mapping(self, obj: Dict[Any, Any]):
+        _write_varint(self.out, len(obj))
+        for key, val in obj.items():
+            self.value(key)
+            self.value(val)
+
+    def getvalue(self) -> bytes:
+        header = bytearray(MAGIC)
+        header.append(VERSION)
+        _write_varint(header, len(self.strings))
+        # Dicts preserve insertion order, so the table is ordered by index.
+        for s in self.strings:
+            encoded = s.encode("utf-8")
+            _write_varint(header, len(encoded))
+            header += encoded
+        return bytes(header + self.out)
+
+
+class _Decoder:
+    def __init__(self, data: bytes, intern_pool=None):
+        self.data = memoryview(data)
+        if bytes(self.data[:4]) != MAGIC:
+            raise ValueError("Data is not a modelcards binary payload.")
+        version = self.data[4]
+        if version > VERSION:
+            raise ValueError(
+                f"Unsupported modelcards binary payload version {version}. Maximum"
+                f" supported version is {VERSION}."
+            )
+        self.pos = 5
+        self.strings: List[str] = []
+        for _ in range(self.varint()):
+            size = self.varint()
+            if self.pos + size > len(self.data):
+                raise IndexError("string runs past the end of the payload")
+            s = str(self.data[self.pos : self.pos + size], "utf-8")
+            if intern_pool is not None:
+                s = intern_pool.intern(s)
+            self.strings.append(s)
+            self.pos += size
+
+    def varint(self) -> int:
+        data = self.data
+        result = shift = 0
+        while True:
+            b = data[self.pos]
+            self.pos += 1
+            result |= (b & 0x7F) << shift
+            if b < 0x80:
+                return result
+            shift += 7
+
+    def value(self) -> Any:
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _TAG_STR:
+            return self.strings[self.varint()]
+        elif tag == _TAG_NONE:
+            return None
+        elif tag == _TAG_INT:
+            n = self.varint()
+            return n >> 1 if not n & 1 else -((n + 1) >> 1)
+        elif tag == _TAG_FLOAT:
+            (f,) = _FLOAT.unpack_from(self.data, self.pos)
+            self.pos += 8
+            return f
+        elif tag == _TAG_TRUE:
+            return True
+        elif tag == _TAG_FALSE:
+            return False
+        elif tag == _TAG_LIST:
+            return [self.value() for _ in range(self.varint())]
+        elif tag == _TAG_DICT:
+            return self.mapping()
+        elif tag == _TAG_EVAL_RESULT:
+            return EvalResult(*[self.value() for _ in range(self.varint())])
+        elif tag == _TAG_CARD_DATA:
+            return CardData(**self.mapping())
+        elif tag == _TAG_DATETIME:
+            return datetime.datetime.fromisoformat(self.value())
+        elif tag == _TAG_DATE:
+            return datetime.date.fromisoformat(self.value())
+        raise ValueError(f"Unknown tag {tag} at offset {self.pos - 1}.")
+
+    def mapping(self) -> Dict[Any, Any]:
+        result = {}
+        for _ in range(self.varint()):
+            key = self.value()
+            result[key] = self.value()
+        return result
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode a `CardData`, `EvalResult` or plain YAML-like value to bytes.
+
+    Args:
+        obj (`Any`):
+            The object to encode. Supported types are `None`, `bool`, `int`,
+            `float`, `str`, `list`, `tuple`, `dict`, `datetime.date`,
+            `datetime.datetime`, `modelcards.EvalResult` and `modelcards.CardData`.
+
+    Returns:
+        `bytes`: The encoded payload.
+
+    Example:
+        >>> from modelcards.serialization import dumps, loads
+        >>> loads(dumps({"tags": ["a", "b", "a"]}))
+        {'tags': ['a', 'b', 'a']}
+    """
+    encoder = _Encoder()
+    encoder.value(obj)
+    return encoder.getvalue()
+
+
+def loads(data: bytes, intern_pool: Optional[Any] = None) -> Any:
+    """Decode a payload produced by `modelcards.serialization.dumps`.
+
+    Args:
+        data (`bytes`):
+            The encoded payload.
+        intern_pool (`modelcards.interning.InternPool`, *optional*):
+            If provided, every decoded string is passed through the pool so strings
+            shared across many decoded cards are only held in memory once.
+
+    Returns:
+        `Any`: The decoded object.
+
+    Raises:
+        ValueError: When the payload is malformed or was written by a newer version.
+    """
+    try:
+        return _Decoder(data, intern_pool=intern_pool).value()
+    except (IndexError, struct.error):
+        raise ValueError("Modelcards binary payload is truncated.")
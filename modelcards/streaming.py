@@ -0,0 +1,223 @@
+"""Incremental parsing of the `model-index` found in a card's metadata.
+
+`RepoCard` loads the whole YAML block with `yaml.safe_load` before converting the
+model index to `EvalResult`s, so both the nested Python tree and the list of eval
+results are held in memory at once. For cards with very large eval tables, the
+functions in this module walk the YAML event stream instead and only ever build one
+metric entry (plus its task and dataset) at a time.
+"""
+
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional, Tuple, Union
+
+import yaml
+
+from .card_data import EvalResult, model_index_to_eval_results
+
+
+def iter_eval_results(
+    stream: Union[str, bytes, IO], intern_pool: Optional[Any] = None
+) -> Iterator[Tuple[str, EvalResult]]:
+    """Lazily yields the eval results found in the `model-index` of a YAML metadata
+    block, without loading the whole block.
+
+    Args:
+        stream (`Union[str, bytes, IO]`):
+            The YAML metadata block (not the full README.md) or a file-like object
+            reading it. Use `iter_card_eval_results` to read from a README.md file.
+        intern_pool (`modelcards.interning.InternPool`, *optional*):
+            If provided, the strings of the yielded eval results are interned in the
+            pool.
+
+    Yields:
+        `Tuple[str, EvalResult]`: The model name and each `modelcards.EvalResult`, in
+        the order they appear in the model index.
+
+    Raises:
+        ValueError: When the metadata block is not a dictionary.
+        KeyError: When a required key of the model index is missing.
+
+    Example:
+        >>> from modelcards.streaming import iter_eval_results
+        >>> yaml_block = '''
+        ... license: mit
+        ... model-index:
+        ... - name: my-cool-model
+        ...   results:
+        ...   - task: {type: image-classification}
+        ...     dataset: {type: beans, name: Beans}
+        ...     metrics:
+        ...     - {type: acc, value: 0.9}
+        ...     - {type: f1, value: 0.8}
+        ... '''
+        >>> [(name, r.metric_type) for name, r in iter_eval_results(yaml_block)]
+        [('my-cool-model', 'acc'), ('my-cool-model', 'f1')]
+    """
+    loader = yaml.SafeLoader(stream)
+    try:
+        loader.get_event()  # StreamStartEvent
+        if loader.check_event(yaml.StreamEndEvent):
+            return
+        loader.get_event()  # DocumentStartEvent
+        if not loader.check_event(yaml.MappingStartEvent):
+            raise ValueError("repo card metadata block should be a dict")
+        loader.get_event()
+
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _construct_next(loader)
+            if key == "model-index":
+                yield from _iter_model_index(loader, intern_pool)
+            else:
+                # Other metadata is composed and dropped one key at a time.
+                loader.compose_node(None, None)
+    finally:
+        loader.dispose()
+
+
+def iter_card_eval_results(
+    path: Union[str, Path], intern_pool: Optional[Any] = None
+) -> Iterator[Tuple[str, EvalResult]]:
+    """Lazily yields the eval results found in the metadata of a README.md file. Only
+    the YAML block at the top of the file is read.
+
+    Args:
+        path (`Union[str, Path]`):
+            Path to the README.md file.
+        intern_pool (`modelcards.interning.InternPool`, *optional*):
+            If provided, the strings of the yielded eval results are interned in the
+            pool.
+
+    Yields:
+        `Tuple[str, EvalResult]`: The model name and each `modelcards.EvalResult`.
+    """
+    with open(path, encoding="utf-8") as f:
+        yield from iter_eval_results(_YamlBlockReader(f), intern_pool=intern_pool)
+
+
+class _YamlBlockReader:
+    """File-like object reading only the `---` delimited YAML block of a card. Reads
+    nothing if the first line of the card is not `---`, so horizontal rules in the
+    body of a card without metadata are not mistaken for a YAML block."""
+
+    def __init__(self, f: IO[str]):
+        self._lines = iter(f)
+        self._state = "before"
+
+    def read(self, size: int = -1) -> str:
+        chunks = []
+        length = 0
+        while self._state != "after" and (size < 0 or length < size):
+            line = next(self._lines, None)
+            if line is None:
+                self._state = "after"
+            elif line.rstrip("\r\n") == "---":
+                self._state = "inside" if self._state == "before" else "after"
+            elif self._state == "before":
+                self._state = "after"
+            elif self._state == "inside":
+                chunks.append(line)
+                length += len(line)
+        return "".join(chunks)
+
+
+def _construct_next(loader: yaml.SafeLoader) -> Any:
+    return loader.construct_document(loader.compose_node(None, None))
+
+
+def _iter_model_index(loader, intern_pool):
+    if not loader.check_event(yaml.SequenceStartEvent):
+        # Not a list (e.g. an alias), there's nothing to stream.
+        model_index = _construct_next(loader)
+        if not model_index:
+            return
+        model_name, eval_results = model_index_to_eval_results(
+            model_index, intern_pool=intern_pool
+        )
+        for eval_result in eval_results:
+            yield model_name, eval_result
+        return
+
+    loader.get_event()
+    while not loader.check_event(yaml.SequenceEndEvent):
+        loader.get_event()  # MappingStartEvent of a model
+        model_name = None
+        # Eval results seen before the model's name, in case `name` isn't first.
+        pending = []
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _construct_next(loader)
+            if key == "name":
+                model_name = _construct_next(loader)
+                for eval_result in pending:
+                    yield model_name, eval_result
+                pending = []
+            elif key == "results":
+                for eval_result in _iter_results(loader, intern_pool):
+                    if model_name is None:
+                        pending.append(eval_result)
+                    else:
+                        yield model_name, eval_result
+            else:
+                loader.compose_node(None, None)
+        loader.get_event()
+        if pending:
+            raise KeyError("name")
+    loader.get_event()
+
+
+def _iter_results(loader, intern_pool):
+    loader.get_event()  # SequenceStartEvent
+    while not loader.check_event(yaml.SequenceEndEvent):
+        loader.get_event()  # MappingStartEvent of a result
+        task = dataset = None
+        # Metrics seen before the task and dataset, in case those aren't first.
+        pending = []
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _construct_next(loader)
+            if key == "task":
+                task = _construct_next(loader)
+                if intern_pool is not None:
+                    intern_pool.intern_value(task)
+            elif key == "dataset":
+                dataset = _construct_next(loader)
+                if intern_pool is not None:
+                    intern_pool.intern_value(dataset)
+            elif key == "metrics":
+                loader.get_event()  # SequenceStartEvent
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    metric = _construct_next(loader)
+                    if task is None or dataset is None:
+                        pending.append(metric)
+                    else:
+                        yield _make_eval_result(task, dataset, metric, intern_pool)
+                loader.get_event()
+            else:
+                loader.compose_node(None, None)
+        loader.get_event()
+        for metric in pending:
+            yield _make_eval_result(task or {}, dataset or {}, metric, intern_pool)
+    loader.get_event()
+
+
+def _make_eval_result(
+    task: Dict[str, Any],
+    dataset: Dict[str, Any],
+    metric: Dict[str, Any],
+    intern_pool,
+) -> EvalResult:
+    if intern_pool is not None:
+        intern_pool.intern_value(metric)
+    return EvalResult(
+        task_type=task["type"],  # Required
+        dataset_type=dataset["type"],  # Required
+        dataset_name=dataset["name"],  # Required
+        metric_type=metric["type"],  # Required
+        metric_value=metric["value"],  # Required
+        task_name=task.get("name"),
+        dataset_config=dataset.get("config"),
+        dataset_split=dataset.get("split"),
+        dataset_revision=dataset.get("revision"),
+        dataset_args=dataset.get("args"),
+        metric_name=metric.get("name"),
+        metric_args=metric.get("args"),
+        verified=metric.get("verified"),
+    )
@@ -24,6 +24,15 @@ setup(
     ),
     license="MIT",
     install_requires=requirements,
+    extras_require={"export": ["pyarrow"]},
     packages=find_packages(),
     include_package_data=True,
+    entry_points={
+        "console_scripts": [
+            "modelcards-build=modelcards.build:main",
+            "modelcards-crawl=modelcards.crawler:main",
+            "modelcards-diff=modelcards.diff:main",
+            "modelcards-export=modelcards.export:main",
+        ],
+    },
 )
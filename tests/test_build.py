@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+
+import pytest
+
+from modelcards import RepoCard
+from modelcards.build import Target, build, load_targets, main, render_target, watch
+
+TEMPLATE = "---\n{{ card_data }}\n---\n# {{ model_id }}\n\n{{ eval_results_table }}\n"
+DATA = """
+license: mit
+model-index:
+- name: model-{i}
+  results:
+  - task: {{type: image-classification}}
+    dataset: {{type: beans, name: Beans}}
+    metrics:
+    - {{type: acc, value: 0.9}}
+template_kwargs:
+  model_id: model-{i}
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "template.md").write_text(TEMPLATE)
+    targets = []
+    for i in range(3):
+        (tmp_path / f"data-{i}.yaml").write_text(DATA.format(i=i))
+        targets.append(
+            {
+                "output": f"models/model-{i}/README.md",
+                "data": f"data-{i}.yaml",
+                "template": "template.md",
+            }
+        )
+    (tmp_path / "cards.yaml").write_text(json.dumps({"targets": targets}))
+    return tmp_path
+
+
+def test_load_targets_and_render(project):
+    targets = load_targets(project / "cards.yaml")
+    assert targets[1] == Target(
+        output=project / "models/model-1/README.md",
+        data=project / "data-1.yaml",
+        template=project / "template.md",
+    )
+    card = render_target(targets[1])
+    assert card.data.model_name == "model-1"
+    assert card.data.license == "mit"
+    assert card.text.startswith("# model-1\n\n| Task |")
+
+
+def test_load_targets_errors(tmp_path):
+    (tmp_path / "cards.yaml").write_text("targets: {}")
+    with pytest.raises(ValueError, match="list of `targets`"):
+        load_targets(tmp_path / "cards.yaml")
+    (tmp_path / "cards.yaml").write_text("targets: [{output: README.md}]")
+    with pytest.raises(ValueError, match="`output` and a `data` path"):
+        load_targets(tmp_path / "cards.yaml")
+
+
+def test_default_template(tmp_path):
+    (tmp_path / "data.yaml").write_text("license: mit\n")
+    target = Target(output=tmp_path / "README.md", data=tmp_path / "data.yaml")
+    card = render_target(target)
+    assert card.data.license == "mit"
+    assert "## Model description" in card.text
+
+
+def test_incremental_build(project):
+    manifest = project / "manifest.json"
+    targets = load_targets(project / "cards.yaml")
+    outputs = [str(t.output) for t in targets]
+
+    assert build(targets, manifest) == {"built": outputs, "skipped": [], "failed": []}
+    assert RepoCard.load(targets[0].output).data.model_name == "model-0"
+
+    # Restarting with the manifest skips everything.
+    assert build(load_targets(project / "cards.yaml"), manifest)["skipped"] == outputs
+
+    # Only the target whose data changed is rebuilt.
+    targets[1].data.write_text(DATA.format(i=1).replace("mit", "apache-2.0"))
+    assert build(targets, manifest)["built"] == [outputs[1]]
+    assert RepoCard.load(targets[1].output).data.license == "apache-2.0"
+
+    # A changed template rebuilds all of its targets.
+    targets[0].template.write_text(TEMPLATE + "\nMore text.\n")
+    assert build(targets, manifest)["built"] == outputs
+
+    # Modified or deleted outputs are regenerated.
+    targets[2].output.write_text("edited")
+    targets[0].output.unlink()
+    assert build(targets, manifest)["built"] == [outputs[0], outputs[2]]
+    assert targets[0].output.exists()
+
+    assert build(targets, manifest, force=True)["built"] == outputs
+
+
+def test_failed_targets_are_retried(project):
+    manifest = project / "manifest.json"
+    targets = load_targets(project / "cards.yaml")
+    targets[0].data.write_text("- not a dict\n")
+    report = build(targets, manifest)
+    assert report["failed"] == [str(targets[0].output)]
+    assert build(targets, manifest)["failed"] == [str(targets[0].output)]
+
+    targets[0].data.write_text(DATA.format(i=0))
+    assert build(targets, manifest)["built"] == [str(targets[0].output)]
+
+
+def test_watch(project):
+    reports = []
+    built = threading.Event()
+    stop = threading.Event()
+
+    def on_build(report):
+        reports.append(report)
+        built.set()
+
+    thread = threading.Thread(
+        target=watch,
+        args=(project / "cards.yaml",),
+        kwargs=dict(interval=0.01, on_build=on_build, stop=stop),
+    )
+    thread.start()
+    try:
+        assert built.wait(10)
+        assert len(reports[0]["built"]) == 3
+
+        built.clear()
+        time.sleep(0.05)
+        (project / "data-2.yaml").write_text(DATA.format(i=2).replace("0.9", "0.95"))
+        assert built.wait(10)
+        assert reports[-1] == {
+            "built": [str(project / "models/model-2/README.md")],
+            "skipped": [],
+            "failed": [],
+        }
+    finally:
+        stop.set()
+        thread.join()
+    assert (project / ".modelcards-manifest.json").exists()
+
+
+def test_main(project, capsys):
+    main([str(project / "cards.yaml")])
+    assert len(json.loads(capsys.readouterr().out)["built"]) == 3
+    main([str(project / "cards.yaml")])
+    assert len(json.loads(capsys.readouterr().out)["skipped"]) == 3
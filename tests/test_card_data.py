@@ -1,3 +1,6 @@
+import copy
+import dataclasses
+import pickle
 from pathlib import Path
 
 import pytest
@@ -6,6 +9,8 @@ from modelcards import ModelCard
 from modelcards.card_data import (
     CardData,
     EvalResult,
+    FrozenCardData,
+    eval_results_to_markdown,
     eval_results_to_model_index,
     model_index_to_eval_results,
 )
@@ -137,3 +142,261 @@ def test_abitrary_incoming_card_data():
 
     data_dict = data.to_dict()
     assert data_dict["some_abitrary_kwarg"] == "some_value"
+
+
+def test_eval_results_to_markdown():
+    eval_results = [
+        EvalResult(
+            task_type="image-classification",
+            dataset_type="beans",
+            dataset_name="Beans",
+            dataset_split="test",
+            metric_type="acc",
+            metric_value=0.9,
+        ),
+        EvalResult(
+            task_type="image-classification",
+            dataset_type="cats_vs_dogs",
+            dataset_name="Cats | Dogs",
+            metric_type="acc",
+            metric_value=0.8,
+            verified=True,
+        ),
+        EvalResult(
+            task_type="image-classification",
+            dataset_type="beans",
+            dataset_name="Beans",
+            dataset_split="test",
+            metric_type="f1",
+            metric_name="F1",
+            metric_value=0.7,
+        ),
+    ]
+
+    table = eval_results_to_markdown(eval_results)
+
+    assert table.splitlines()[2:] == [
+        "| image-classification | Beans | test | acc | 0.9 |",
+        "| | | test | F1 | 0.7 |",
+        "| image-classification | Cats \\| Dogs | | acc | 0.8 (verified) |",
+    ]
+    # Equal eval results reuse the cached table.
+    assert eval_results_to_markdown(copy.deepcopy(eval_results)) is table
+    eval_results[0].metric_value = 0.95
+    assert "| 0.95 |" in eval_results_to_markdown(eval_results)
+
+
+def _result(metric_type, metric_value, dataset_split=None):
+    return EvalResult(
+        task_type="image-classification",
+        dataset_type="beans",
+        dataset_name="Beans",
+        dataset_split=dataset_split,
+        metric_type=metric_type,
+        metric_value=metric_value,
+    )
+
+
+def test_merge_eval_results():
+    data = CardData(
+        model_name="my-cool-model",
+        eval_results=[_result("acc", 0.9), _result("acc", 0.8, dataset_split="test")],
+    )
+
+    counts = data.merge_eval_results(
+        r for r in [_result("acc", 0.95), _result("f1", 0.7), _result("f1", 0.75)]
+    )
+
+    assert counts == {"added": 1, "replaced": 1, "kept": 0}
+    assert [
+        (r.metric_type, r.dataset_split, r.metric_value) for r in data.eval_results
+    ] == [
+        ("acc", None, 0.95),
+        ("acc", "test", 0.8),
+        ("f1", None, 0.75),
+    ]
+
+    counts = data.merge_eval_results(_result("acc", 0.1, "test"), policy="keep")
+    assert counts == {"added": 0, "replaced": 0, "kept": 1}
+    assert data.eval_results[1].metric_value == 0.8
+
+
+def test_merge_eval_results_error_policy():
+    data = CardData(model_name="my-cool-model", eval_results=[_result("acc", 0.9)])
+    with pytest.raises(ValueError, match="already exists"):
+        data.merge_eval_results(
+            [_result("f1", 0.7), _result("acc", 0.1)], policy="error"
+        )
+    # Nothing is merged when an error is raised.
+    assert len(data.eval_results) == 1
+
+    with pytest.raises(ValueError, match="should be one of"):
+        data.merge_eval_results([], policy="overwrite")
+
+
+def test_merge_eval_results_into_empty_card_data():
+    data = CardData()
+    with pytest.raises(ValueError, match="requires `model_name`"):
+        data.merge_eval_results([_result("acc", 0.9)])
+
+    data.model_name = "my-cool-model"
+    data.merge_eval_results([_result("acc", 0.9)])
+    assert data.to_dict()["model-index"][0]["results"][0]["metrics"] == [
+        {"type": "acc", "value": 0.9}
+    ]
+
+
+def test_card_data_fingerprint():
+    a = CardData(
+        language="en",
+        license="mit",
+        some_dict={"a": 1, "b": None, "c": [1, 2]},
+        model_name="my-cool-model",
+        eval_results=[_result("acc", 0.9), _result("f1", 0.8)],
+    )
+    b = CardData(
+        model_name="my-cool-model",
+        eval_results=[_result("f1", 0.8), _result("acc", 0.9)],
+        some_dict={"c": [1, 2], "a": 1},
+        license="mit",
+        language="en",
+        tags=None,
+    )
+    assert a.fingerprint() == b.fingerprint()
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len({a, b}) == 1
+    assert a != CardData(language="en")
+    assert a != "not card data"
+
+    # Order of lists other than eval results matters.
+    b.some_dict["c"] = [2, 1]
+    assert a != b
+    b.some_dict["c"] = [1, 2]
+
+    # Reassigning a field of an eval result invalidates its memoized digest.
+    b.eval_results[0].metric_value = 0.85
+    assert a != b
+    b.eval_results[0].metric_value = 0.8
+    assert a == b
+
+    b.merge_eval_results([_result("precision", 0.1)])
+    assert a != b
+
+
+def test_card_data_fingerprint_distinguishes_types():
+    assert CardData(x="1") != CardData(x=1)
+    assert CardData(x=1) != CardData(x=1.0)
+    assert CardData(x=True) != CardData(x=1)
+    assert CardData(x=["a", "b"]) != CardData(x=["ab"])
+    assert CardData(eval_results=[], model_name="m") != CardData(model_name="m")
+
+
+def test_eval_result_fingerprint_sees_in_place_changes():
+    a, b = _result("bleu", 0.3), _result("bleu", 0.3)
+    a.metric_args = {"max_order": 4}
+    b.metric_args = {"max_order": 4}
+    data = CardData(model_name="my-cool-model", eval_results=[a])
+    fingerprint = data.fingerprint()
+    assert a == b
+
+    a.metric_args["max_order"] = 2
+    assert data.fingerprint() != fingerprint
+    assert a != b
+    assert EvalResult(**vars(a)) == a
+    assert "_digest" not in vars(a)
+
+
+def test_eval_result_eq_and_hash_agree():
+    pairs = [
+        (_result("acc", 1), _result("acc", 1.0)),
+        (_result("acc", 0.9), _result("acc", 0.9)),
+    ]
+    a, b = _result("acc", 0.9), _result("acc", 0.9)
+    a.metric_args, b.metric_args = {"x": None}, {}
+    pairs.append((a, b))
+    for a, b in pairs:
+        assert (a == b) == (hash(a) == hash(b)) == (b in {a})
+    assert _result("acc", 1) != _result("acc", 1.0)
+    assert a == b
+
+    # Reassigning a field to an equal value of another type is noticed too.
+    c = _result("acc", 1)
+    fingerprint = c.fingerprint()
+    c.metric_value = 1.0
+    assert c.fingerprint() != fingerprint
+
+
+def test_frozen_card_data():
+    tags = ["vision"]
+    data = CardData(
+        language="en",
+        tags=tags,
+        eval_results=[_result("acc", 0.9)],
+        model_name="my-cool-model",
+        extra={"a": [1]},
+    )
+    frozen = data.freeze()
+    assert isinstance(frozen, FrozenCardData)
+    assert frozen.freeze() is frozen
+    assert frozen == data
+    assert hash(frozen) == hash(data)
+    assert frozen.to_yaml() == data.to_yaml()
+    assert frozen.tags == ("vision",)
+
+    # Values are copied, so later changes to the originals are not seen.
+    tags.append("resnet")
+    data.eval_results[0].metric_value = 0.5
+    assert frozen.tags == ("vision",)
+    assert frozen.eval_results[0].metric_value == 0.9
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frozen.license = "mit"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        del frozen.tags
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frozen.eval_results[0].metric_value = 0.5
+    with pytest.raises(TypeError):
+        frozen.extra["a"] = 2
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frozen.merge_eval_results(_result("f1", 0.8))
+
+
+def test_frozen_card_data_replace_and_thaw():
+    frozen = FrozenCardData(
+        language="en",
+        tags=["vision"],
+        eval_results=[_result("acc", 0.9)],
+        model_name="my-cool-model",
+    )
+    replaced = frozen.replace(license="mit")
+    assert replaced.license == "mit"
+    assert frozen.license is None
+    assert replaced.tags is frozen.tags
+    assert replaced.eval_results is frozen.eval_results
+    with pytest.raises(ValueError, match="requires `model_name`"):
+        frozen.replace(model_name=None)
+
+    thawed = frozen.thaw()
+    assert type(thawed) is CardData
+    assert thawed == frozen
+    thawed.tags.append("resnet")
+    thawed.eval_results[0].metric_value = 0.5
+    assert frozen.tags == ("vision",)
+    assert frozen.eval_results[0] == _result("acc", 0.9)
+    assert _result("acc", 0.9) == frozen.eval_results[0]
+
+    assert CardData(license="mit").replace(license="apache-2.0").license == "apache-2.0"
+
+
+def test_frozen_card_data_copy_and_serialize():
+    frozen = FrozenCardData(
+        eval_results=[_result("acc", 0.9)], model_name="my-cool-model", tags=["a"]
+    )
+    assert copy.deepcopy(frozen) is frozen
+    unpickled = pickle.loads(pickle.dumps(frozen))
+    assert isinstance(unpickled, FrozenCardData)
+    assert unpickled == frozen
+    assert FrozenCardData.from_bytes(frozen.to_bytes()) == frozen
+    card = ModelCard.from_template(frozen)
+    assert card.data == frozen
@@ -7,7 +7,7 @@ import pytest
 import requests
 from huggingface_hub import create_repo, delete_repo
 
-from modelcards import CardData, ModelCard, RepoCard
+from modelcards import CardData, EvalResult, ModelCard, RepoCard
 
 from .hub_fixtures import HF_TOKEN, HF_USERNAME
 
@@ -172,6 +172,35 @@ def test_push_to_hub(repo_id):
     r.raise_for_status()
 
 
+def test_push_to_hub_keeps_model_name(monkeypatch):
+    import huggingface_hub
+
+    uploaded = []
+    monkeypatch.setattr(RepoCard, "validate", lambda self, repo_type=None: None)
+    monkeypatch.setattr(
+        huggingface_hub,
+        "upload_file",
+        lambda path_or_fileobj, **kwargs: uploaded.append(
+            Path(path_or_fileobj).read_text()
+        ),
+    )
+    card = ModelCard.from_template(
+        CardData(
+            model_name="my-cool-model",
+            eval_results=EvalResult(
+                task_type="image-classification",
+                dataset_type="beans",
+                dataset_name="Beans",
+                metric_type="acc",
+                metric_value=0.9,
+            ),
+        )
+    )
+    card.push_to_hub("user/other-name")
+    assert card.data.model_name == "my-cool-model"
+    assert RepoCard(uploaded[0]).data.model_name == "other-name"
+
+
 def test_push_and_create_pr(repo_id):
     template_path = Path(__file__).parent / "samples" / "sample_template.md"
     card = ModelCard.from_template(
@@ -195,3 +224,56 @@ def test_push_and_create_pr(repo_id):
     r = requests.get(url)
     data = r.json()
     assert data["count"] == 1
+
+
+def test_model_card_from_default_template_with_eval_results():
+    card = ModelCard.from_template(
+        card_data=CardData(
+            model_name="my-cool-model",
+            eval_results=[
+                EvalResult(
+                    task_type="image-classification",
+                    dataset_type="beans",
+                    dataset_name="Beans",
+                    metric_type="acc",
+                    metric_value=0.9,
+                ),
+            ],
+        ),
+    )
+    eval_results_body = card.sections["Eval results"].body
+    assert "| image-classification | Beans | | acc | 0.9 |" in eval_results_body
+    assert "BibTeX entry and citation info" in card.sections
+
+
+def test_update_eval_results_table():
+    sample_path = Path(__file__).parent / "samples" / "sample_simple_model_index.md"
+    card = ModelCard.load(sample_path)
+    card.update_eval_results_table()
+    assert "| acc | 0.9 |" in card.sections["Eval results"].body
+
+    card.data.eval_results[0].metric_value = 0.95
+    card.update_eval_results_table()
+    assert card.text.count("## Eval results") == 1
+    assert "| acc | 0.95 |" in card.sections["Eval results"].body
+    assert "Model description" in card.sections
+
+
+def test_repocard_fingerprint():
+    sample_path = Path(__file__).parent / "samples" / "sample_simple_model_index.md"
+    card = RepoCard.load(sample_path)
+    same_card = RepoCard(str(card))
+    assert card.fingerprint() == same_card.fingerprint()
+    assert card == same_card
+    assert hash(card) == hash(same_card)
+
+    same_card.text += "\nMore text."
+    assert card != same_card
+
+    same_card = RepoCard(str(card))
+    same_card.sections.append("More text.")
+    assert card != same_card
+
+    same_card = RepoCard(str(card))
+    same_card.data.license = "apache-2.0"
+    assert card != same_card
@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import pytest
+
+from modelcards import RepoCard
+from modelcards.corpus import CorpusReader, CorpusWriter
+from modelcards.interning import InternPool
+
+SAMPLES_DIR = Path(__file__).parent / "samples"
+SAMPLES = ["sample_simple.md", "sample_simple_model_index.md", "sample_no_metadata.md"]
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    path = tmp_path / "cards.mcpk"
+    with CorpusWriter(path) as writer:
+        for name in SAMPLES:
+            writer.add(name, (SAMPLES_DIR / name).read_text())
+    return path
+
+
+def test_roundtrip(corpus_path):
+    with CorpusReader(corpus_path) as reader:
+        assert len(reader) == 3
+        assert list(reader.repo_ids()) == SAMPLES
+        for i, name in enumerate(SAMPLES):
+            expected = RepoCard((SAMPLES_DIR / name).read_text())
+            assert reader[i] == expected
+            assert reader[name] == expected
+            assert str(reader[name]) == str(expected)
+        assert reader[-1] == reader[SAMPLES[-1]]
+
+
+def test_card_is_parsed_lazily(corpus_path):
+    with CorpusReader(corpus_path) as reader:
+        card = reader["sample_simple_model_index.md"]
+        assert "data" not in card.__dict__
+        assert "_text" not in card.__dict__
+        assert card.data.model_name == "my-cool-model"
+        assert "_text" not in card.__dict__
+        assert card.text.startswith("\n# my-cool-model")
+        assert (
+            card.content == (SAMPLES_DIR / "sample_simple_model_index.md").read_text()
+        )
+
+
+def test_header_and_body_views(corpus_path):
+    with CorpusReader(corpus_path) as reader:
+        header = reader.header("sample_simple.md")
+        assert isinstance(header, memoryview)
+        assert str(header, "utf-8").startswith("language:\n- en\nlicense: mit")
+        assert len(reader.header("sample_no_metadata.md")) == 0
+        assert (
+            bytes(reader.body(2))
+            == (SAMPLES_DIR / "sample_no_metadata.md").read_bytes()
+        )
+        del header
+
+
+def test_metadata(corpus_path):
+    with CorpusReader(corpus_path) as reader:
+        assert reader.metadata("sample_simple.md").license == "mit"
+        assert reader.metadata("sample_no_metadata.md").to_dict() == {}
+        assert [repo_id for repo_id, _ in reader.iter_metadata()] == SAMPLES
+
+
+def test_lookup_errors(corpus_path):
+    with CorpusReader(corpus_path) as reader:
+        assert "sample_simple.md" in reader
+        assert "missing" not in reader
+        with pytest.raises(KeyError):
+            reader["missing"]
+        with pytest.raises(IndexError):
+            reader[3]
+
+
+def test_add_repocard_and_duplicates(tmp_path):
+    card = RepoCard((SAMPLES_DIR / "sample_simple_model_index.md").read_text())
+    with CorpusWriter(tmp_path / "cards.mcpk") as writer:
+        writer.add("user/model", card)
+        with pytest.raises(ValueError, match="already added"):
+            writer.add("user/model", card)
+        assert len(writer) == 1
+    with CorpusReader(tmp_path / "cards.mcpk") as reader:
+        assert reader["user/model"] == card
+
+
+def test_add_repocard_without_metadata(tmp_path):
+    card = RepoCard("# My model\n")
+    with CorpusWriter(tmp_path / "cards.mcpk") as writer:
+        writer.add("user/model", card)
+    with CorpusReader(tmp_path / "cards.mcpk") as reader:
+        assert len(reader.header("user/model")) == 0
+        assert reader["user/model"].content == "# My model\n"
+        assert reader["user/model"] == card
+
+
+def test_intern_pool(corpus_path):
+    pool = InternPool()
+    with CorpusReader(corpus_path, intern_pool=pool) as reader:
+        a = reader.metadata("sample_simple.md")
+        b = reader.metadata("sample_simple_model_index.md")
+    assert a.license is b.license
+    assert pool.memory_report()["hits"] > 0
+
+
+def test_close_with_live_cards(corpus_path):
+    reader = CorpusReader(corpus_path)
+    card = reader[0]
+    reader.close()
+    assert card.data.license == "mit"
+
+
+@pytest.mark.parametrize("content", [b"", b"not a corpus" * 10])
+def test_invalid_file(tmp_path, content):
+    path = tmp_path / "invalid.mcpk"
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match="not a packed card corpus"):
+        CorpusReader(path)
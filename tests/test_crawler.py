@@ -0,0 +1,106 @@
+import json
+import time
+from pathlib import Path
+
+from modelcards.crawler import RateLimiter, crawl, main, read_repo_ids
+
+SAMPLES_DIR = Path(__file__).parent / "samples"
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+def test_crawl_and_resume(tmp_path):
+    repo_ids = [
+        str(SAMPLES_DIR / "sample_simple.md"),
+        str(SAMPLES_DIR / "sample_simple_model_index.md"),
+        str(SAMPLES_DIR / "sample_invalid_card_data.md"),
+    ]
+    output_path = tmp_path / "cards.jsonl"
+
+    counts = crawl(repo_ids[:2], output_path, max_workers=1)
+    assert counts == {"loaded": 2, "failed": 0, "skipped": 0}
+
+    counts = crawl(repo_ids, output_path, max_workers=2)
+    assert counts == {"loaded": 0, "failed": 1, "skipped": 2}
+
+    records = {r["repo_id"]: r for r in _read_jsonl(output_path)}
+    assert len(records) == 3
+    assert records[repo_ids[0]]["data"]["license"] == "mit"
+    model_index = records[repo_ids[1]]["data"]["model-index"]
+    assert model_index[0]["name"] == "my-cool-model"
+    assert "should be a dict" in records[repo_ids[2]]["error"]
+    # Failures are not checkpointed, so they are retried.
+    checkpoint_path = tmp_path / "cards.jsonl.checkpoint"
+    assert checkpoint_path.read_text().splitlines() == repo_ids[:2]
+
+
+def test_crawl_retries_failures_on_resume(tmp_path):
+    path = tmp_path / "flaky.md"
+    path.write_text("---\n- not a dict\n---\n# Flaky\n")
+    output_path = tmp_path / "cards.jsonl"
+
+    counts = crawl([str(path)], output_path, max_workers=1)
+    assert counts == {"loaded": 0, "failed": 1, "skipped": 0}
+
+    path.write_text((SAMPLES_DIR / "sample_simple.md").read_text())
+    counts = crawl([str(path)], output_path, max_workers=1)
+    assert counts == {"loaded": 1, "failed": 0, "skipped": 0}
+
+    counts = crawl([str(path)], output_path, max_workers=1)
+    assert counts == {"loaded": 0, "failed": 0, "skipped": 1}
+    records = _read_jsonl(output_path)
+    assert ["error" in r for r in records] == [True, False]
+    assert records[1]["data"]["license"] == "mit"
+
+
+def test_crawl_many_with_bounded_pool(tmp_path):
+    content = (SAMPLES_DIR / "sample_simple.md").read_text()
+    repo_ids = []
+    for i in range(50):
+        path = tmp_path / f"model-{i}.md"
+        path.write_text(content)
+        repo_ids.append(str(path))
+
+    counts = crawl(iter(repo_ids), tmp_path / "out.jsonl", max_workers=4)
+    assert counts["loaded"] == 50
+    assert sorted(r["repo_id"] for r in _read_jsonl(tmp_path / "out.jsonl")) == sorted(
+        repo_ids
+    )
+
+
+def test_read_repo_ids(tmp_path):
+    listing = tmp_path / "repos.txt"
+    listing.write_text(
+        '# org listing\nuser/a\n\n{"id": "user/b"}\n{"modelId": "user/c"}\n'
+    )
+    assert list(read_repo_ids(listing)) == ["user/a", "user/b", "user/c"]
+
+
+def test_rate_limiter_spaces_calls_per_host():
+    limiter = RateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait("huggingface.co")
+    limiter.wait("other.host")
+    assert time.monotonic() - start >= 0.075
+
+    start = time.monotonic()
+    RateLimiter(rate=None).wait("huggingface.co")
+    assert time.monotonic() - start < 0.01
+
+
+def test_main(tmp_path, capsys):
+    listing = tmp_path / "repos.txt"
+    listing.write_text(str(SAMPLES_DIR / "sample_simple.md") + "\n")
+    output_path = tmp_path / "cards.jsonl"
+
+    main([str(listing), "--output", str(output_path), "--workers", "2"])
+
+    assert json.loads(capsys.readouterr().out) == {
+        "loaded": 1,
+        "failed": 0,
+        "skipped": 0,
+    }
+    assert len(_read_jsonl(output_path)) == 1
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from modelcards import CardData, EvalResult, RepoCard
+from modelcards.corpus import CorpusWriter
+from modelcards.diff import diff_cards, diff_tree, main
+
+
+def _card(license="mit", eval_results=None, body="# My model\n\nSome text.\n"):
+    data = CardData(
+        license=license, eval_results=eval_results, model_name="my-cool-model"
+    )
+    return RepoCard(f"---\n{data.to_yaml()}\n---\n{body}")
+
+
+def _result(metric_type="acc", value=0.9):
+    return EvalResult(
+        task_type="image-classification",
+        dataset_type="beans",
+        dataset_name="Beans",
+        metric_type=metric_type,
+        metric_value=value,
+    )
+
+
+def test_diff_identical_cards():
+    diff = diff_cards(_card(eval_results=[_result()]), _card(eval_results=[_result()]))
+    assert not diff
+    assert diff.to_dict() == {}
+
+
+def test_diff_metadata():
+    old = _card()
+    new = _card(license="apache-2.0")
+    new.data.tags = ["vision"]
+    diff = diff_cards(old, new)
+    assert diff.metadata == {
+        "license": ("mit", "apache-2.0"),
+        "tags": (None, ["vision"]),
+    }
+    assert not diff.body
+
+
+@pytest.mark.parametrize("old_value, new_value", [("1", "1.0"), ("true", "1")])
+def test_diff_metadata_types(old_value, new_value):
+    old = RepoCard(f"---\nx: {old_value}\n---\nbody\n")
+    new = RepoCard(f"---\nx: {new_value}\n---\nbody\n")
+    assert old != new
+    diff = diff_cards(old, new)
+    assert diff
+    assert diff.metadata == {"x": (old.data.x, new.data.x)}
+
+
+def test_diff_eval_results():
+    old = _card(eval_results=[_result("acc", 0.9), _result("f1", 0.8)])
+    new = _card(
+        eval_results=[
+            _result("f1", 0.85),
+            _result("acc", 0.9),
+            _result("precision", 0.7),
+        ]
+    )
+    diff = diff_cards(old, new)
+    assert diff.metadata == {}
+    assert [r.metric_type for r in diff.eval_results_added] == ["precision"]
+    assert diff.eval_results_removed == []
+    assert [(o.metric_value, n.metric_value) for o, n in diff.eval_results_updated] == [
+        (0.8, 0.85)
+    ]
+    # Reordering eval results is not a change.
+    assert not diff_cards(
+        old, _card(eval_results=list(reversed(old.data.eval_results)))
+    )
+
+    diff = diff_cards(new, old)
+    assert [r.metric_type for r in diff.eval_results_removed] == ["precision"]
+    assert diff.to_dict() == {"eval_results": {"added": 0, "removed": 1, "updated": 1}}
+
+
+def test_diff_body():
+    diff = diff_cards(_card(), _card(body="# My model\n\nOther text.\n"))
+    assert "-Some text.\n" in diff.body
+    assert "+Other text.\n" in diff.body
+    assert diff.to_dict() == {"body": {"added_lines": 1, "removed_lines": 1}}
+
+
+@pytest.fixture
+def trees(tmp_path):
+    local, remote = tmp_path / "local", tmp_path / "remote"
+    cards = {
+        "user/unchanged": (_card(), _card()),
+        "user/changed": (_card(), _card(license="apache-2.0")),
+        "user/new": (None, _card()),
+    }
+    for repo_id, (old, new) in cards.items():
+        new.save(local / repo_id / "README.md")
+        if old is not None:
+            old.save(remote / repo_id / "README.md")
+    (local / "user/broken").mkdir(parents=True)
+    (local / "user/broken/README.md").write_text("---\n- a\n---\n# Broken\n")
+    return local, remote
+
+
+EXPECTED_REPORT = {
+    "changed": {"user/changed": {"metadata": {"license": ["mit", "apache-2.0"]}}},
+    "new": ["user/new"],
+    "errors": {"user/broken": "ValueError: repo card metadata block should be a dict"},
+    "unchanged": 1,
+}
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_diff_tree(trees, num_workers):
+    local, remote = trees
+    assert diff_tree(local, remote, num_workers=num_workers, batch_size=1) == (
+        EXPECTED_REPORT
+    )
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_diff_tree_against_corpus(trees, tmp_path, num_workers):
+    local, remote = trees
+    with CorpusWriter(tmp_path / "remote.mcpk") as writer:
+        for path in remote.rglob("README.md"):
+            writer.add(path.parent.relative_to(remote).as_posix(), path.read_text())
+    report = diff_tree(
+        local, tmp_path / "remote.mcpk", num_workers=num_workers, batch_size=1
+    )
+    assert report == EXPECTED_REPORT
+
+
+def test_diff_tree_errors(trees, tmp_path):
+    local, remote = trees
+    with pytest.raises(ValueError, match="not a directory"):
+        diff_tree(tmp_path / "missing", remote)
+    with pytest.raises(ValueError, match="not a packed card corpus"):
+        diff_tree(local, local / "user/new/README.md")
+
+
+def test_main(trees, capsys):
+    local, remote = trees
+    main([str(local), str(remote), "--workers", "0"])
+    assert json.loads(capsys.readouterr().out) == EXPECTED_REPORT
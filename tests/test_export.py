@@ -0,0 +1,142 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from modelcards import CardData, EvalResult
+from modelcards.corpus import CorpusWriter
+from modelcards.export import (
+    CARD_COLUMNS,
+    EVAL_RESULT_COLUMNS,
+    card_data_to_rows,
+    export_cards,
+    main,
+)
+
+SAMPLES_DIR = Path(__file__).parent / "samples"
+SAMPLES = [
+    "sample_simple.md",
+    "sample_simple_model_index.md",
+    "sample_no_metadata.md",
+    "sample_invalid_card_data.md",
+]
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+@pytest.fixture
+def cards_dir(tmp_path):
+    root = tmp_path / "cards"
+    for i in range(10):
+        for name in SAMPLES:
+            repo_dir = root / f"user-{i}" / Path(name).stem
+            repo_dir.mkdir(parents=True)
+            shutil.copy(SAMPLES_DIR / name, repo_dir / "README.md")
+    return root
+
+
+def test_card_data_to_rows():
+    data = CardData(
+        language="en",
+        license="mit",
+        tags=["a", "b"],
+        co2_eq_emissions=12,
+        error="not an export error",
+        eval_results=[
+            EvalResult(
+                task_type="image-classification",
+                dataset_type="beans",
+                dataset_name="Beans",
+                metric_type="acc",
+                metric_value=1,
+                dataset_args={"a": 1},
+            ),
+            EvalResult(
+                task_type="image-classification",
+                dataset_type="beans",
+                dataset_name="Beans",
+                metric_type="f1",
+                metric_value="20.0 ± 1.2",
+            ),
+        ],
+        model_name="my-cool-model",
+    )
+    (card_row,), (eval_row, raw_eval_row) = card_data_to_rows("user/model", data)
+    assert list(card_row) == CARD_COLUMNS
+    assert card_row["language"] == ["en"]
+    assert card_row["num_eval_results"] == 2
+    assert card_row["error"] is None
+    assert json.loads(card_row["extra"]) == {
+        "co2_eq_emissions": 12,
+        "error": "not an export error",
+    }
+    assert list(eval_row) == EVAL_RESULT_COLUMNS
+    assert eval_row["model_name"] == "my-cool-model"
+    assert eval_row["metric_value"] == 1.0
+    assert eval_row["metric_value_raw"] == "1"
+    assert raw_eval_row["metric_value"] is None
+    assert raw_eval_row["metric_value_raw"] == "20.0 ± 1.2"
+    assert eval_row["dataset_args"] == '{"a": 1}'
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_export_directory(cards_dir, tmp_path, num_workers):
+    output_dir = tmp_path / "out"
+    counts = export_cards(cards_dir, output_dir, batch_size=3, num_workers=num_workers)
+    assert counts == {"cards": 40, "eval_results": 10, "errors": 10}
+
+    cards = {r["repo_id"]: r for r in _read_jsonl(output_dir / "cards.jsonl")}
+    assert len(cards) == 40
+    assert cards["user-3/sample_simple"]["license"] == "mit"
+    assert cards["user-3/sample_no_metadata"]["license"] is None
+    assert "should be a dict" in cards["user-3/sample_invalid_card_data"]["error"]
+
+    eval_results = _read_jsonl(output_dir / "eval_results.jsonl")
+    assert {r["repo_id"] for r in eval_results} == {
+        f"user-{i}/sample_simple_model_index" for i in range(10)
+    }
+    assert eval_results[0]["metric_type"] == "acc"
+
+
+def test_export_paths_and_corpus_match(cards_dir, tmp_path):
+    paths = sorted(cards_dir.rglob("README.md"))
+    export_cards(paths, tmp_path / "from_paths", num_workers=0)
+
+    with CorpusWriter(tmp_path / "cards.mcpk") as writer:
+        for path in paths:
+            writer.add(str(path), path.read_text())
+    counts = export_cards(
+        tmp_path / "cards.mcpk", tmp_path / "from_corpus", num_workers=2
+    )
+    assert counts["cards"] == 40
+
+    for table in ("cards.jsonl", "eval_results.jsonl"):
+        assert _read_jsonl(tmp_path / "from_paths" / table) == _read_jsonl(
+            tmp_path / "from_corpus" / table
+        )
+
+
+def test_export_parquet(cards_dir, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    export_cards(cards_dir, tmp_path, format="parquet", batch_size=8, num_workers=0)
+    cards = pq.ParquetFile(tmp_path / "cards.parquet")
+    assert cards.metadata.num_rows == 40
+    assert cards.metadata.num_row_groups == 5
+    assert pq.read_table(tmp_path / "eval_results.parquet").num_rows == 10
+
+
+def test_export_errors(cards_dir, tmp_path):
+    with pytest.raises(ValueError, match="should be one of"):
+        export_cards(cards_dir, tmp_path, format="csv")
+    with pytest.raises(ValueError, match="not a packed card corpus"):
+        export_cards(SAMPLES_DIR / "sample_simple.md", tmp_path)
+    with pytest.raises(ValueError, match="does not exist"):
+        export_cards(tmp_path / "missing", tmp_path)
+
+
+def test_main(cards_dir, tmp_path, capsys):
+    main([str(cards_dir), "--output-dir", str(tmp_path), "--workers", "0"])
+    assert json.loads(capsys.readouterr().out)["cards"] == 40
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+# Modules that must only be imported when a card is loaded from, validated against or
+# pushed to the Hub, or rendered from a template.
+LAZY_MODULES = ["huggingface_hub", "jinja2", "requests", "tempfile"]
+
+# Cumulative import time budget in microseconds. It is generous on purpose, so the
+# test catches a heavy dependency sneaking back in rather than machine noise.
+IMPORT_TIME_BUDGET_US = {"modelcards": 500_000}
+
+
+def _import_times(statement):
+    """Runs `statement` with `python -X importtime` and returns the cumulative import
+    time of each module, in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _imported_by(statement):
+    """Returns the top level modules imported by `statement`, ignoring those that the
+    interpreter already imports at startup (e.g. from `.pth` files)."""
+    startup = _import_times("pass")
+    return {name for name in _import_times(statement) if name not in startup}
+
+
+def test_import_does_not_load_heavy_dependencies():
+    imported = _imported_by("import modelcards")
+    loaded = [m for m in LAZY_MODULES if m in imported]
+    assert not loaded, f"`import modelcards` eagerly imports {loaded}"
+
+
+def test_import_time_budget():
+    times = _import_times("import modelcards")
+    for module, budget in IMPORT_TIME_BUDGET_US.items():
+        assert (
+            times[module] < budget
+        ), f"Importing {module} took {times[module]}us, budget is {budget}us"
+
+
+def test_card_data_usable_without_heavy_dependencies():
+    imported = _imported_by(
+        "from modelcards import CardData; CardData(license='mit').to_yaml()"
+    )
+    assert not [m for m in LAZY_MODULES if m in imported]
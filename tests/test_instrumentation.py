@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pytest
+
+from modelcards import CardData, ModelCard, RepoCard
+from modelcards.instrumentation import (
+    StatsCollector,
+    add_span_callback,
+    opentelemetry_callback,
+    remove_span_callback,
+    span,
+)
+
+
+def test_span_is_noop_without_callbacks():
+    assert span("parse") is span("to_yaml")
+
+
+def test_stats_collector_records_parse_render_and_to_yaml():
+    sample_path = Path(__file__).parent / "samples" / "sample_simple.md"
+    content = sample_path.read_text(encoding="utf-8")
+
+    with StatsCollector() as stats:
+        RepoCard(content)
+        ModelCard.from_template(CardData(language="en"), model_id="my-cool-model")
+
+    summary = stats.summary()
+    assert summary["parse"]["count"] == 2
+    assert summary["parse"]["bytes"] > len(content.encode("utf-8"))
+    assert summary["render"]["count"] == 1
+    assert summary["render"]["bytes"] > 0
+    assert summary["to_yaml"]["count"] == 1
+    assert summary["to_yaml"]["total_ns"] > 0
+
+    # Once the collector is unregistered, spans are no-ops again.
+    CardData(language="en").to_yaml()
+    assert stats.summary()["to_yaml"]["count"] == 1
+
+    stats.reset()
+    assert stats.summary() == {}
+
+
+def test_span_records_errors_and_survives_failing_callbacks():
+    spans = []
+
+    def failing_callback(span):
+        raise RuntimeError("boom")
+
+    add_span_callback(failing_callback)
+    add_span_callback(spans.append)
+    try:
+        with pytest.raises(ValueError):
+            RepoCard("---\n- a\n- b\n---\n# Hello")
+    finally:
+        remove_span_callback(failing_callback)
+        remove_span_callback(spans.append)
+
+    assert spans[0].name == "parse"
+    assert isinstance(spans[0].error, ValueError)
+
+
+def test_remove_bound_method_callback():
+    spans = []
+    add_span_callback(spans.append)
+    add_span_callback(spans.append)
+    remove_span_callback(spans.append)
+    assert span("parse") is not span("parse")
+    remove_span_callback(spans.append)
+    assert span("parse") is span("to_yaml")
+
+
+def test_opentelemetry_callback():
+    class FakeSpan:
+        def __init__(self, name, start_time, attributes):
+            self.name, self.start_time, self.attributes = name, start_time, attributes
+
+        def record_exception(self, exc):
+            self.exception = exc
+
+        def end(self, end_time):
+            self.end_time = end_time
+
+    class FakeTracer:
+        def __init__(self):
+            self.spans = []
+
+        def start_span(self, name, start_time, attributes):
+            self.spans.append(FakeSpan(name, start_time, attributes))
+            return self.spans[-1]
+
+    tracer = FakeTracer()
+    callback = opentelemetry_callback(tracer)
+    add_span_callback(callback)
+    try:
+        yaml_block = CardData(language="en").to_yaml()
+    finally:
+        remove_span_callback(callback)
+
+    (otel_span,) = tracer.spans
+    assert otel_span.name == "modelcards.to_yaml"
+    assert otel_span.attributes == {"modelcards.bytes": len(yaml_block)}
+    assert otel_span.end_time >= otel_span.start_time
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from modelcards import CardData, EvalResult, ModelCard
+from modelcards.card_data import model_index_to_eval_results
+from modelcards.interning import InternPool
+
+
+def _fresh(s):
+    # Build an equal string that is a distinct object from `s`.
+    return "".join(list(s))
+
+
+def test_intern_returns_shared_string():
+    pool = InternPool()
+    a = pool.intern(_fresh("image-classification"))
+    b = pool.intern(_fresh("image-classification"))
+    assert a is b
+    assert pool.intern(0.9) == 0.9
+    assert len(pool) == 1
+
+    report = pool.memory_report()
+    assert report["unique_strings"] == 1
+    assert report["lookups"] == 2
+    assert report["hits"] == 1
+    assert report["duplicate_bytes"] > 0
+
+    pool.clear()
+    assert pool.memory_report()["lookups"] == 0
+    assert len(pool) == 0
+
+
+def test_cards_loaded_with_pool_share_strings():
+    sample_path = Path(__file__).parent / "samples" / "sample_simple_model_index.md"
+    pool = InternPool()
+    card_a = ModelCard.load(sample_path, intern_pool=pool)
+    card_b = ModelCard.load(sample_path, intern_pool=pool)
+
+    assert card_a.data.license is card_b.data.license
+    assert card_a.data.tags[0] is card_b.data.tags[0]
+    result_a, result_b = card_a.data.eval_results[0], card_b.data.eval_results[0]
+    assert result_a.task_type is result_b.task_type
+    assert result_a.metric_type is result_b.metric_type
+    assert pool.memory_report()["hits"] > 0
+
+
+def test_model_index_to_eval_results_with_pool():
+    pool = InternPool()
+    shared = pool.intern("beans")
+    model_index = [
+        {
+            "name": "my-cool-model",
+            "results": [
+                {
+                    "task": {"type": "image-classification"},
+                    "dataset": {"type": _fresh("beans"), "name": "Beans"},
+                    "metrics": [{"type": "acc", "value": 0.9}],
+                }
+            ],
+        }
+    ]
+    _, eval_results = model_index_to_eval_results(model_index, intern_pool=pool)
+    assert eval_results[0].dataset_type is shared
+
+
+def test_intern_value_updates_eval_results_and_card_data():
+    pool = InternPool()
+    eval_result = EvalResult(
+        task_type=_fresh("image-classification"),
+        dataset_type="beans",
+        dataset_name="Beans",
+        metric_type="acc",
+        metric_value=0.9,
+        metric_args={_fresh("k"): _fresh("v")},
+    )
+    card_data = CardData(
+        tags=[_fresh("image-classification")],
+        model_name="my-cool-model",
+        eval_results=[eval_result],
+    )
+    pool.intern_value(card_data)
+
+    assert card_data.tags[0] is eval_result.task_type
+    assert eval_result.metric_args == {"k": "v"}
+
+
+def test_from_bytes_with_pool():
+    pool = InternPool()
+    card_data = CardData(license="mit", tags=["resnet"])
+    a = CardData.from_bytes(card_data.to_bytes(), intern_pool=pool)
+    b = CardData.from_bytes(card_data.to_bytes(), intern_pool=pool)
+    assert a.license is b.license
+    assert a.tags[0] is b.tags[0]
+
+
+def test_counters_across_threads():
+    pool = InternPool()
+    values = [_fresh(f"tag-{i % 10}") for i in range(400)]
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(pool.intern, values))
+
+    report = pool.memory_report()
+    assert report["unique_strings"] == 10
+    assert report["lookups"] == 400
+    assert report["hits"] == 390
+
+    pool.clear()
+    assert pool.memory_report()["lookups"] == 0
+    assert pool.intern(values[0]) is values[0]
+    assert pool.memory_report()["lookups"] == 1
@@ -0,0 +1,161 @@
+from pathlib import Path
+
+import pytest
+
+from modelcards import CardData, ModelCard, RepoCard
+from modelcards import sections as sections_module
+from modelcards.sections import SectionIndex
+
+TEXT = """Intro text
+
+# Title
+
+## Usage ##
+
+```python
+# not a heading
+```
+
+~~~
+## still not a heading
+~~~
+
+## Eval results
+
+TODO
+
+### BibTeX
+
+cite
+"""
+
+
+def test_section_index_skips_fenced_code_blocks():
+    sections = SectionIndex(TEXT)
+    assert [(s.level, s.title) for s in sections] == [
+        (0, None),
+        (1, "Title"),
+        (2, "Usage"),
+        (2, "Eval results"),
+        (3, "BibTeX"),
+    ]
+    assert sections.preamble.body == "Intro text\n\n"
+    assert "# not a heading" in sections["Usage"].body
+    assert "## still not a heading" in sections["## Usage"].body
+    assert "BibTeX" in sections
+    assert "Missing" not in sections
+    assert sections.get("Missing") is None
+    with pytest.raises(KeyError):
+        sections["Missing"]
+
+
+def test_section_offsets():
+    sections = SectionIndex(TEXT)
+    start, end = sections.offset("Eval results")
+    assert TEXT[start:end] == "## Eval results\n\nTODO\n\n"
+    assert sections["Eval results"].start == start
+
+
+def test_section_edits():
+    sections = SectionIndex(TEXT)
+    sections.replace_body("Eval results", "\n| acc | 0.9 |")
+    sections.insert_before("Usage", "## Installation\n\npip install x\n")
+    sections.insert_after("BibTeX", "more")
+    sections.append("## Appendix\n\nnotes\n")
+
+    text = sections.text
+    assert "## Eval results\n\n| acc | 0.9 |\n### BibTeX\n" in text
+    assert "# Title\n\n## Installation\n\npip install x\n## Usage ##\n" in text
+    assert text.endswith("cite\nmore\n## Appendix\n\nnotes\n")
+    assert sections["Installation"].body == "\npip install x\n"
+    assert sections.modified
+
+    # Offsets are still correct after edits.
+    start, end = sections.offset("Appendix")
+    assert text[start:end] == "## Appendix\n\nnotes\n"
+
+    # The index stays consistent with a freshly built one.
+    rebuilt = SectionIndex(text)
+    assert [(s.title, s.text) for s in rebuilt] == [(s.title, s.text) for s in sections]
+
+
+def test_section_replace_and_duplicate_titles():
+    sections = SectionIndex("## A\n\none\n## B\n\ntwo\n## A\n\nthree\n")
+    assert [s.body for s in sections.find_all("A")] == ["\none\n", "\nthree\n"]
+
+    sections.replace("A", "## C\n\nfour\n")
+    assert sections.text == "## C\n\nfour\n## B\n\ntwo\n## A\n\nthree\n"
+    assert sections["A"].body == "\nthree\n"
+
+    sections.insert_before("B", "## A\n\nzero\n")
+    assert [s.body for s in sections.find_all("A")] == ["\nzero\n", "\nthree\n"]
+
+    # Replacing a section with text without heading merges it in the previous one.
+    sections.replace("B", "plain")
+    assert sections.text == "## C\n\nfour\n## A\n\nzero\nplain\n## A\n\nthree\n"
+    assert "B" not in sections
+
+
+def test_repeated_inserts_only_scan_the_inserted_text(monkeypatch):
+    scanned = []
+    parse = sections_module._parse
+
+    def counting_parse(text, *args, **kwargs):
+        scanned.append(len(text))
+        return parse(text, *args, **kwargs)
+
+    monkeypatch.setattr(sections_module, "_parse", counting_parse)
+    sections = SectionIndex(TEXT)
+    for i in range(1000):
+        sections.insert_after("Usage", f"line {i}\n")
+        sections.append(f"end {i}\n")
+    sections.insert_before("BibTeX", "before\n")
+
+    # The text was scanned once when indexed, then only the inserted text was.
+    assert sum(scanned) == len(sections.text)
+    assert "line 999\n## Eval results" in sections.text
+    assert sections.text.endswith("end 998\nend 999\n")
+    rebuilt = SectionIndex(sections.text)
+    assert [(s.title, s.text) for s in rebuilt] == [(s.title, s.text) for s in sections]
+
+
+def test_insert_into_open_code_fence():
+    sections = SectionIndex("## A\n\n```\ncode\n")
+    sections.append("## not a heading\n")
+    assert "not a heading" not in sections
+    sections.insert_before("A", "```\n")
+    assert "A" not in sections
+    assert sections.text == "```\n## A\n\n```\ncode\n## not a heading\n"
+
+
+def test_append_to_empty_text():
+    sections = SectionIndex("")
+    sections.append("# Title\n")
+    assert sections.text == "# Title\n"
+    assert sections["Title"].level == 1
+
+
+def test_repocard_sections():
+    card = ModelCard.from_template(CardData(language="en"), model_id="my-cool-model")
+    assert card.sections["my-cool-model"].level == 1
+    # The template's code block comments are not headings.
+    assert "You can include sample code" not in card.sections
+
+    card.sections.replace_body("Eval results", "\n| acc | 0.9 |\n\n")
+    assert "## Eval results\n\n| acc | 0.9 |\n\n### BibTeX" in card.text
+    assert "| acc | 0.9 |" in str(card)
+
+    # Assigning text drops the index.
+    card.text = "# New\n"
+    assert "Eval results" not in card.sections
+    assert card.sections["New"].level == 1
+
+
+def test_repocard_sections_roundtrip(tmp_path):
+    sample_path = Path(__file__).parent / "samples" / "sample_simple.md"
+    card = RepoCard.load(sample_path)
+    card.sections.insert_after("Model description", "Some more details.\n")
+    card.save(tmp_path / "README.md")
+
+    updated = RepoCard.load(tmp_path / "README.md")
+    assert "Some more details." in updated.sections["Model description"].body
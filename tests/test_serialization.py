@@ -0,0 +1,81 @@
+import datetime
+import pickle
+from pathlib import Path
+
+import pytest
+
+from modelcards import CardData, EvalResult, ModelCard
+from modelcards.serialization import dumps, loads
+
+
+def _eval_results(n):
+    return [
+        EvalResult(
+            task_type="image-classification",
+            dataset_type="beans",
+            dataset_name="Beans",
+            dataset_split="test",
+            metric_type=f"metric-{i % 10}",
+            metric_value=i / 10,
+            metric_args={"k": i},
+            verified=i % 2 == 0,
+        )
+        for i in range(n)
+    ]
+
+
+def test_card_data_bytes_roundtrip():
+    sample_path = Path(__file__).parent / "samples" / "sample_simple_model_index.md"
+    card_data = ModelCard.load(sample_path).data
+
+    decoded = CardData.from_bytes(card_data.to_bytes())
+
+    assert decoded.to_dict() == card_data.to_dict()
+    assert decoded.eval_results == card_data.eval_results
+
+
+def test_card_data_bytes_roundtrip_arbitrary_values():
+    card_data = CardData(
+        language=["en", "fr"],
+        some_int=-123456789012345678901234567890,
+        some_float=-0.5,
+        some_date=datetime.date(2022, 7, 1),
+        some_nested={"a": [1, None, True, {"b": "c"}]},
+    )
+
+    decoded = CardData.from_bytes(card_data.to_bytes())
+
+    assert decoded.__dict__ == card_data.__dict__
+
+
+def test_eval_result_bytes_roundtrip():
+    eval_result = _eval_results(1)[0]
+    assert EvalResult.from_bytes(eval_result.to_bytes()) == eval_result
+
+
+def test_strings_are_stored_once():
+    card_data = CardData(model_name="my-cool-model", eval_results=_eval_results(1000))
+    payload = card_data.to_bytes()
+    assert payload.count(b"image-classification") == 1
+    assert len(payload) < len(pickle.dumps(card_data))
+
+
+def test_from_bytes_rejects_invalid_payloads():
+    with pytest.raises(ValueError, match="not a modelcards binary payload"):
+        CardData.from_bytes(b"not a card")
+
+    with pytest.raises(ValueError, match="Unsupported modelcards binary payload"):
+        loads(b"MCRD\xff\x00\x00")
+
+    with pytest.raises(ValueError, match="truncated"):
+        loads(b"MCRD\x01")
+    payload = dumps(CardData(language="en", tags=["a"], x=1.5))
+    for size in range(len(payload)):
+        with pytest.raises(ValueError):
+            loads(payload[:size])
+
+    with pytest.raises(ValueError, match="does not contain CardData"):
+        CardData.from_bytes(dumps({"language": "en"}))
+
+    with pytest.raises(TypeError, match="cannot be encoded"):
+        dumps(CardData(language=object()))
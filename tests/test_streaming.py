@@ -0,0 +1,118 @@
+import tracemalloc
+from pathlib import Path
+
+import pytest
+import yaml
+
+from modelcards import CardData, EvalResult, ModelCard
+from modelcards.card_data import model_index_to_eval_results
+from modelcards.interning import InternPool
+from modelcards.streaming import iter_card_eval_results, iter_eval_results
+
+
+def _card_data(n):
+    return CardData(
+        license="mit",
+        model_name="my-cool-model",
+        eval_results=[
+            EvalResult(
+                task_type="image-classification",
+                dataset_type=f"dataset-{i % 3}",
+                dataset_name=f"Dataset {i % 3}",
+                dataset_split="test",
+                metric_type=f"metric-{i}",
+                metric_value=i / 10,
+                metric_args={"k": i},
+            )
+            for i in range(n)
+        ],
+        tags=["a", "b"],
+    )
+
+
+def test_iter_eval_results_matches_model_index_to_eval_results():
+    yaml_block = _card_data(50).to_yaml()
+    expected_name, expected = model_index_to_eval_results(
+        yaml.safe_load(yaml_block)["model-index"]
+    )
+
+    streamed = list(iter_eval_results(yaml_block))
+
+    assert [name for name, _ in streamed] == [expected_name] * len(expected)
+    assert [eval_result for _, eval_result in streamed] == expected
+
+
+def test_iter_card_eval_results_from_file():
+    sample_path = Path(__file__).parent / "samples" / "sample_simple_model_index.md"
+    card = ModelCard.load(sample_path)
+
+    streamed = list(iter_card_eval_results(sample_path))
+
+    assert streamed == [(card.data.model_name, card.data.eval_results[0])]
+
+
+def test_iter_card_eval_results_without_metadata():
+    sample_path = Path(__file__).parent / "samples" / "sample_no_metadata.md"
+    assert list(iter_card_eval_results(sample_path)) == []
+    assert list(iter_eval_results("")) == []
+    assert list(iter_eval_results("license: mit")) == []
+
+
+def test_iter_card_eval_results_ignores_horizontal_rules(tmp_path):
+    path = tmp_path / "README.md"
+    path.write_text("# Title\n\ntext\n\n---\n\nMore\n---\nmodel-index: 1\n")
+    assert list(iter_card_eval_results(path)) == []
+
+
+def test_iter_eval_results_handles_unordered_keys_and_aliases():
+    yaml_block = """
+defaults: &beans {type: beans, name: Beans}
+model-index:
+- results:
+  - metrics:
+    - {type: acc, value: 0.9}
+    dataset: *beans
+    task: {type: image-classification}
+  name: my-cool-model
+"""
+    ((name, eval_result),) = iter_eval_results(yaml_block)
+    assert name == "my-cool-model"
+    assert eval_result.dataset_name == "Beans"
+    assert eval_result.metric_type == "acc"
+
+
+def test_iter_eval_results_invalid():
+    with pytest.raises(ValueError, match="should be a dict"):
+        list(iter_eval_results("- a\n- b"))
+
+    invalid_model_index = (
+        "model-index:\n- name: x\n  results:\n  - metrics: [{value: 1}]"
+    )
+    with pytest.raises(KeyError):
+        list(iter_eval_results(invalid_model_index))
+
+
+def test_iter_eval_results_with_intern_pool():
+    pool = InternPool()
+    yaml_block = _card_data(10).to_yaml()
+    first = [r for _, r in iter_eval_results(yaml_block, intern_pool=pool)]
+    second = [r for _, r in iter_eval_results(yaml_block, intern_pool=pool)]
+    assert first[0].metric_type is second[0].metric_type
+
+
+def test_iter_card_eval_results_bounded_memory(tmp_path):
+    path = tmp_path / "README.md"
+    path.write_text(f"---\n{_card_data(300).to_yaml()}\n---\n# Hello")
+
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_card_eval_results(path))
+        _, streamed_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        ModelCard.load(path)
+        _, loaded_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert count == 300
+    assert streamed_peak * 10 < loaded_peak
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from modelcards import CardData, EvalResult, ModelCard, RepoCard
+from modelcards.instrumentation import StatsCollector
+from modelcards.interning import InternPool
+
+NUM_THREADS = 8
+NUM_TASKS = 200
+
+
+def _card_data(i):
+    return CardData(
+        language="en",
+        license="mit",
+        tags=["image-classification", f"tag-{i % 7}"],
+        model_name="my-cool-model",
+        eval_results=[
+            EvalResult(
+                task_type="image-classification",
+                dataset_type="beans",
+                dataset_name="Beans",
+                metric_type=metric,
+                metric_value=round(0.5 + i / 1000, 3),
+            )
+            for metric in ("acc", "f1", "precision")
+        ],
+    )
+
+
+def test_concurrent_render_and_parse():
+    pool = InternPool()
+    shared = _card_data(0).freeze()
+    barrier = threading.Barrier(NUM_THREADS)
+
+    def task(i):
+        if i < NUM_THREADS:
+            # Start the first tasks together to maximize contention.
+            barrier.wait()
+        card_data = shared.replace(tags=["image-classification", f"tag-{i % 7}"])
+        card = ModelCard.from_template(card_data, model_id=f"model-{i % 5}")
+        parsed = RepoCard(str(card), intern_pool=pool)
+        return i, str(card), parsed
+
+    with StatsCollector() as stats:
+        with ThreadPoolExecutor(NUM_THREADS) as executor:
+            results = list(executor.map(task, range(NUM_TASKS)))
+
+    for i, content, parsed in results:
+        expected = ModelCard.from_template(
+            _card_data(0).replace(tags=["image-classification", f"tag-{i % 7}"]),
+            model_id=f"model-{i % 5}",
+        )
+        assert content == str(expected)
+        assert parsed == expected
+    assert shared == _card_data(0)
+
+    report = pool.memory_report()
+    # Every lookup is counted exactly once, even under contention.
+    assert report["lookups"] == report["hits"] + report["unique_strings"]
+    summary = stats.summary()
+    assert summary["render"]["count"] == NUM_TASKS
+    assert summary["parse"]["count"] == 2 * NUM_TASKS